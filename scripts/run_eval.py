@@ -23,7 +23,7 @@ from hedgeagent.models.ollama_client import OllamaClient, probe_ollama, select_p
 from hedgeagent.schemas.episode import TaskGenerationConfig
 
 
-def build_agent(name: str, model_name: str | None, ollama_config: OllamaConfig):
+def build_agent(name: str, model_name: str | None, ollama_config: OllamaConfig, prompt_version: str):
     if name == "always_act":
         return AlwaysActPolicy(), None
     if name == "always_query_until_budget_exhausted":
@@ -39,7 +39,8 @@ def build_agent(name: str, model_name: str | None, ollama_config: OllamaConfig):
     if name == "ollama":
         if not model_name:
             raise ValueError("A model name is required for the ollama agent.")
-        return LLMPolicy(OllamaClient(model_name=model_name, config=ollama_config)), model_name
+        client = OllamaClient(model_name=model_name, config=ollama_config)
+        return LLMPolicy(client, prompt_version=prompt_version), model_name
     raise ValueError(f"Unknown agent: {name}")
 
 
@@ -72,16 +73,20 @@ def main() -> None:
         if not chosen_model:
             raise SystemExit("No local Ollama model available.")
 
-    agent, manifest_model = build_agent(args.agent, chosen_model, ollama_config)
+    agent, manifest_model = build_agent(args.agent, chosen_model, ollama_config, project_config.default_prompt_version)
     episodes = load_or_generate_split(split=eval_config.split, task_config=task_config, project_config=project_config)
-    run_dir, results = evaluate_policy(
-        policy=agent,
-        episodes=episodes,
-        eval_config=eval_config,
-        project_config=project_config,
-        model_config=ollama_config if args.agent == "ollama" else None,
-        output_dir=args.output_dir,
-    )
+    try:
+        run_dir, results = evaluate_policy(
+            policy=agent,
+            episodes=episodes,
+            eval_config=eval_config,
+            project_config=project_config,
+            model_config=ollama_config if args.agent == "ollama" else None,
+            output_dir=args.output_dir,
+        )
+    finally:
+        if isinstance(agent, LLMPolicy) and isinstance(agent.client, OllamaClient):
+            agent.client.close()
     if manifest_model:
         update_model_manifest(
             Path("manifests/model_manifest.json"),
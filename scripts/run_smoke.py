@@ -43,13 +43,14 @@ def main() -> None:
     chosen_model = select_preferred_model(probe, ollama_config.preferred_model_substrings)
     print(f"baseline_smoke={baseline_dir}")
     if chosen_model:
-        model_dir, results = evaluate_policy(
-            policy=LLMPolicy(OllamaClient(model_name=chosen_model, config=ollama_config)),
-            episodes=episodes,
-            eval_config=eval_config,
-            project_config=project_config,
-            model_config=ollama_config,
-        )
+        with OllamaClient(model_name=chosen_model, config=ollama_config) as client:
+            model_dir, results = evaluate_policy(
+                policy=LLMPolicy(client, prompt_version=project_config.default_prompt_version),
+                episodes=episodes,
+                eval_config=eval_config,
+                project_config=project_config,
+                model_config=ollama_config,
+            )
         status = "schema_validated" if all(result.schema_valid_output for result in results) else "smoke_tested"
         update_model_manifest(
             Path("manifests/model_manifest.json"),
@@ -9,7 +9,7 @@ from hedgeagent.schemas.agent import AgentDecision, ModelCallRecord, ToolResultE
 from hedgeagent.schemas.episode import EpisodeState
 
 
-@dataclass
+@dataclass(slots=True)
 class DecisionContext:
     state: EpisodeState
     env: GridWorld
@@ -20,7 +20,7 @@ class DecisionContext:
     rng: random.Random
 
 
-@dataclass
+@dataclass(slots=True)
 class PolicyStepResult:
     decision: AgentDecision | None
     model_call: ModelCallRecord | None = None
@@ -30,6 +30,7 @@ class PolicyStepResult:
 class BasePolicy(ABC):
     name: str = "base"
     model_name: str | None = None
+    prompt_version: str | None = None
 
     @abstractmethod
     def decide(self, context: DecisionContext) -> PolicyStepResult:
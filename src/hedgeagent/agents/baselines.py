@@ -108,8 +108,7 @@ class UncertaintyThresholdPolicy(BasePolicy):
         unknown_fraction = 1.0
         if plan["reachable"] and plan["path"]:
             path = list(plan["path"])
-            unknown_cells = sum(1 for point in path if context.state.observed_map[point.y][point.x] == -1)
-            unknown_fraction = unknown_cells / max(1, len(path))
+            unknown_fraction = int(plan["unknown_cells_on_path"]) / max(1, len(path))
             if unknown_fraction <= self.threshold:
                 return PolicyStepResult(
                     decision=AgentDecision(
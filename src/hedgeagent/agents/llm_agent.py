@@ -8,7 +8,19 @@ from hedgeagent.agents.base import BasePolicy, DecisionContext, PolicyStepResult
 from hedgeagent.models.base import BaseLLMClient, ModelResponse
 from hedgeagent.prompts.prompt_builder import SCHEMA_DESCRIPTION, build_decision_prompt
 from hedgeagent.schemas.agent import AgentDecision, ModelCallRecord
-from hedgeagent.schemas.common import ActionType
+from hedgeagent.schemas.common import ActionType, ToolName
+
+_CANONICAL_ACTION_TYPES = frozenset(action.value for action in ActionType)
+_CANONICAL_TOOL_NAMES = frozenset(tool.value for tool in ToolName)
+
+_REPAIR_PROMPT_PREFIX = (
+    "The previous response was invalid. Return only one JSON object that matches this schema exactly.\n"
+    + SCHEMA_DESCRIPTION
+    + "\nFor QUERY decisions, use tool_args.target, not center.\n"
+)
+_format_repair_details = (
+    "Original task prompt:\n{original_prompt}\nInvalid response:\n{invalid_text}\nValidation error:\n{error_text}\n"
+).format
 
 
 def _extract_json_object(text: str) -> str:
@@ -22,12 +34,18 @@ def _extract_json_object(text: str) -> str:
 class LLMPolicy(BasePolicy):
     name = "ollama"
 
-    def __init__(self, client: BaseLLMClient, prompt_version: str = "decision_prompt_v1.txt") -> None:
+    def __init__(self, client: BaseLLMClient, prompt_version: str = "decision_prompt_v2.txt") -> None:
         self.client = client
         self.prompt_version = prompt_version
         self.model_name = getattr(client, "model_name", None)
 
-    def _to_model_record(self, response: ModelResponse, parse_error: str | None = None, repaired: bool = False) -> ModelCallRecord:
+    def _to_model_record(
+        self,
+        response: ModelResponse,
+        parse_error: str | None = None,
+        repaired: bool = False,
+        normalized: bool = False,
+    ) -> ModelCallRecord:
         return ModelCallRecord(
             model_name=response.model_name,
             prompt=str(response.raw_request.get("prompt") or response.raw_request.get("messages")),
@@ -37,37 +55,44 @@ class LLMPolicy(BasePolicy):
             raw_response=response.raw_response,
             parse_error=parse_error,
             repaired=repaired,
+            normalized=normalized,
+            cached=response.cached,
         )
 
     def _normalize_payload(self, payload: dict[str, Any]) -> tuple[dict[str, Any], bool]:
-        repaired = False
-        normalized = dict(payload)
-        action_type = normalized.get("action_type")
-        tool_args = normalized.get("tool_args")
-        if isinstance(tool_args, dict):
-            tool_args = dict(tool_args)
-            if action_type == ActionType.QUERY.value and "target" not in tool_args and "center" in tool_args:
-                tool_args["target"] = tool_args.pop("center")
-                repaired = True
-            normalized["tool_args"] = tool_args
-        if action_type == ActionType.QUERY.value and normalized.get("chosen_tool") == "reveal_observation":
-            normalized["chosen_tool"] = None
-            repaired = True
-        return normalized, repaired
+        updates: dict[str, Any] = {}
+        action_type = payload.get("action_type")
+        if isinstance(action_type, str) and action_type not in _CANONICAL_ACTION_TYPES:
+            canonical_action = action_type.strip().upper()
+            if canonical_action != action_type:
+                action_type = updates["action_type"] = canonical_action
+        chosen_tool = payload.get("chosen_tool")
+        if isinstance(chosen_tool, str) and chosen_tool not in _CANONICAL_TOOL_NAMES:
+            canonical_tool = chosen_tool.strip().lower()
+            if canonical_tool != chosen_tool:
+                chosen_tool = updates["chosen_tool"] = canonical_tool
+        if action_type == ActionType.QUERY.value:
+            tool_args = payload.get("tool_args")
+            if isinstance(tool_args, dict) and "target" not in tool_args and "center" in tool_args:
+                remapped = {key: value for key, value in tool_args.items() if key != "center"}
+                remapped["target"] = tool_args["center"]
+                updates["tool_args"] = remapped
+            if chosen_tool == "reveal_observation":
+                updates["chosen_tool"] = None
+        if not updates:
+            return payload, False
+        return {**payload, **updates}, True
 
     def _parse_decision(self, response: ModelResponse) -> AgentDecision:
         payload = json.loads(_extract_json_object(response.text))
-        normalized_payload, _repaired = self._normalize_payload(payload)
+        normalized_payload, _normalized = self._normalize_payload(payload)
         return AgentDecision.model_validate(normalized_payload)
 
     def _repair(self, original_prompt: str, invalid_text: str, error_text: str) -> ModelResponse:
-        repair_prompt = (
-            "The previous response was invalid. Return only one JSON object that matches this schema exactly.\n"
-            f"{SCHEMA_DESCRIPTION}\n"
-            "For QUERY decisions, use tool_args.target, not center.\n"
-            f"Original task prompt:\n{original_prompt}\n"
-            f"Invalid response:\n{invalid_text}\n"
-            f"Validation error:\n{error_text}\n"
+        repair_prompt = _REPAIR_PROMPT_PREFIX + _format_repair_details(
+            original_prompt=original_prompt,
+            invalid_text=invalid_text,
+            error_text=error_text,
         )
         return self.client.complete(prompt=repair_prompt, system_prompt="Return only JSON.")
 
@@ -88,11 +113,11 @@ class LLMPolicy(BasePolicy):
             )
         try:
             payload = json.loads(_extract_json_object(response.text))
-            normalized_payload, repaired = self._normalize_payload(payload)
+            normalized_payload, normalized = self._normalize_payload(payload)
             decision = AgentDecision.model_validate(normalized_payload)
             return PolicyStepResult(
                 decision=decision,
-                model_call=self._to_model_record(response, repaired=repaired),
+                model_call=self._to_model_record(response, normalized=normalized),
                 schema_valid=True,
             )
         except (JSONDecodeError, ValueError) as exc:
@@ -109,7 +134,7 @@ class LLMPolicy(BasePolicy):
                 decision = AgentDecision.model_validate(normalized_payload)
                 return PolicyStepResult(
                     decision=decision,
-                    model_call=self._to_model_record(repaired, repaired=True if normalized else True),
+                    model_call=self._to_model_record(repaired, repaired=True, normalized=normalized),
                     schema_valid=True,
                 )
             except (JSONDecodeError, ValueError) as repair_exc:
@@ -14,7 +14,7 @@ class ProjectConfig(BaseModel):
     manifests_dir: str = "manifests"
     default_seed: int = 7
     default_dataset_dir: str = "manifests/generated/datasets"
-    default_prompt_version: str = "decision_prompt_v1.txt"
+    default_prompt_version: str = "decision_prompt_v2.txt"
 
 
 class EvalConfig(BaseModel):
@@ -41,6 +41,10 @@ class OllamaConfig(BaseModel):
     timeout_seconds: float = 30.0
     max_retries: int = 2
     prompt_mode: str = "generate"
+    stream: bool = False
+    response_cache: bool = False
+    response_cache_max_entries: int = 1024
+    response_cache_dir: str | None = None
     preferred_model_substrings: list[str] = Field(default_factory=list)
 
     def endpoint(self) -> str:
@@ -1,21 +1,54 @@
 from __future__ import annotations
 
-from collections import deque
+from collections import Counter, deque
+from collections.abc import Iterator
 from copy import deepcopy
+from itertools import chain
 
 from hedgeagent.schemas.agent import FinalAnswer
 from hedgeagent.schemas.common import CellState, Point
 from hedgeagent.schemas.episode import EpisodeSpec, EpisodeState, ObservationRecord
 
 
+_UNKNOWN = CellState.UNKNOWN.value
+_FREE = CellState.FREE.value
+_BLOCKED = CellState.BLOCKED.value
+
+CELL_CHARS = {_UNKNOWN: "?", _FREE: ".", _BLOCKED: "#"}
+
+
+def iter_ascii_rows(grid: list[list[int]], start: Point, goal: Point) -> Iterator[str]:
+    # The goal is placed first so the start marker wins if both share a cell.
+    for y, row in enumerate(grid):
+        chars = [CELL_CHARS.get(cell, ".") for cell in row]
+        if y == goal.y:
+            chars[goal.x] = "G"
+        if y == start.y:
+            chars[start.x] = "S"
+        yield "".join(chars)
+
+
 class GridWorld:
+    __slots__ = (
+        "spec",
+        "hidden_map",
+        "observed_map",
+        "observation_budget_remaining",
+        "observations_used",
+        "observation_history",
+        "_plan_cache",
+        "_frontier_cache",
+    )
+
     def __init__(self, spec: EpisodeSpec) -> None:
         self.spec = spec
-        self.hidden_map = deepcopy(spec.hidden_map)
-        self.observed_map = deepcopy(spec.observed_map)
+        self.hidden_map = [row[:] for row in spec.hidden_map]
+        self.observed_map = [row[:] for row in spec.observed_map]
         self.observation_budget_remaining = spec.observation_budget
         self.observations_used = 0
         self.observation_history: list[ObservationRecord] = []
+        self._plan_cache: dict[tuple[bool, bool], dict[str, object]] = {}
+        self._frontier_cache: list[tuple[int, int]] | None = None
 
     def visible_state(self) -> EpisodeState:
         return EpisodeState(
@@ -24,7 +57,7 @@ class GridWorld:
             seed=self.spec.seed,
             width=self.spec.width,
             height=self.spec.height,
-            observed_map=deepcopy(self.observed_map),
+            observed_map=self.observed_map,
             start=self.spec.start,
             goal=self.spec.goal,
             semantic_hints=list(self.spec.semantic_hints),
@@ -49,16 +82,22 @@ class GridWorld:
         if self.observation_budget_remaining <= 0:
             raise ValueError("Observation budget exhausted.")
         effective_radius = radius or self.spec.observation_radius
-        newly_revealed = 0
         revealed_points: list[Point] = []
+        x_start = max(0, center.x - effective_radius)
+        x_stop = min(self.spec.width, center.x + effective_radius + 1)
+        observed_map = self.observed_map
+        hidden_map = self.hidden_map
         for y in range(max(0, center.y - effective_radius), min(self.spec.height, center.y + effective_radius + 1)):
-            for x in range(max(0, center.x - effective_radius), min(self.spec.width, center.x + effective_radius + 1)):
-                if self.observed_map[y][x] == CellState.UNKNOWN.value:
-                    newly_revealed += 1
+            observed_row = observed_map[y]
+            for x in range(x_start, x_stop):
+                if observed_row[x] == _UNKNOWN:
                     revealed_points.append(Point(x=x, y=y))
-                self.observed_map[y][x] = self.hidden_map[y][x]
+            observed_row[x_start:x_stop] = hidden_map[y][x_start:x_stop]
+        newly_revealed = len(revealed_points)
         self.observation_budget_remaining -= 1
         self.observations_used += 1
+        self._plan_cache.clear()
+        self._frontier_cache = None
         record = ObservationRecord(
             center=center,
             radius=effective_radius,
@@ -70,20 +109,28 @@ class GridWorld:
         return record
 
     def frontier_points(self) -> list[Point]:
-        frontiers: list[Point] = []
-        seen: set[tuple[int, int]] = set()
-        for y in range(self.spec.height):
-            for x in range(self.spec.width):
-                if self.observed_map[y][x] != CellState.UNKNOWN.value:
+        if self._frontier_cache is None:
+            self._frontier_cache = self._scan_frontier()
+        return [Point(x=x, y=y) for x, y in self._frontier_cache]
+
+    def _scan_frontier(self) -> list[tuple[int, int]]:
+        observed_map = self.observed_map
+        width = self.spec.width
+        last_row = self.spec.height - 1
+        frontiers: list[tuple[int, int]] = []
+        for y, row in enumerate(observed_map):
+            above = observed_map[y - 1] if y > 0 else None
+            below = observed_map[y + 1] if y < last_row else None
+            for x, cell in enumerate(row):
+                if cell != _UNKNOWN:
                     continue
-                point = Point(x=x, y=y)
-                if any(
-                    self._traversable(neighbor, use_hidden=False, optimistic_unknown=False)
-                    for neighbor in self.neighbors(point)
+                if (
+                    (x > 0 and row[x - 1] == _FREE)
+                    or (x + 1 < width and row[x + 1] == _FREE)
+                    or (above is not None and above[x] == _FREE)
+                    or (below is not None and below[x] == _FREE)
                 ):
-                    if point.as_tuple() not in seen:
-                        frontiers.append(point)
-                        seen.add(point.as_tuple())
+                    frontiers.append((x, y))
         return frontiers
 
     def neighbors(self, point: Point) -> list[Point]:
@@ -99,11 +146,11 @@ class GridWorld:
         if not self.within_bounds(point):
             return False
         if use_hidden:
-            return self.hidden_map[point.y][point.x] == CellState.FREE.value
+            return self.hidden_map[point.y][point.x] == _FREE
         value = self.observed_map[point.y][point.x]
-        if value == CellState.BLOCKED.value:
+        if value == _BLOCKED:
             return False
-        if value == CellState.UNKNOWN.value and not optimistic_unknown:
+        if value == _UNKNOWN and not optimistic_unknown:
             return False
         return True
 
@@ -113,38 +160,66 @@ class GridWorld:
         use_hidden: bool = False,
         optimistic_unknown: bool = True,
     ) -> dict[str, object]:
+        key = (use_hidden, optimistic_unknown)
+        cached = self._plan_cache.get(key)
+        if cached is None:
+            cached = self._search_path(use_hidden=use_hidden, optimistic_unknown=optimistic_unknown)
+            self._plan_cache[key] = cached
+        return {**cached, "path": [Point(x=x, y=y) for x, y in cached["path"]]}
+
+    def _search_path(self, *, use_hidden: bool, optimistic_unknown: bool) -> dict[str, object]:
         start = self.spec.start
         goal = self.spec.goal
         if not self._traversable(start, use_hidden=use_hidden, optimistic_unknown=optimistic_unknown):
-            return {"reachable": False, "path": [], "path_length": None, "unknown_cells_on_path": None}
+            return {"reachable": False, "path": (), "path_length": None, "unknown_cells_on_path": None}
         if not self._traversable(goal, use_hidden=use_hidden, optimistic_unknown=optimistic_unknown):
-            return {"reachable": False, "path": [], "path_length": None, "unknown_cells_on_path": None}
+            return {"reachable": False, "path": (), "path_length": None, "unknown_cells_on_path": None}
 
-        queue: deque[Point] = deque([start])
-        parents: dict[tuple[int, int], tuple[int, int] | None] = {start.as_tuple(): None}
+        width = self.spec.width
+        size = width * self.spec.height
+        start_index = start.y * width + start.x
+        goal_index = goal.y * width + goal.x
+        if use_hidden:
+            grid, passable = self.hidden_map, {_FREE}
+        else:
+            grid, passable = self.observed_map, {_FREE, _UNKNOWN} if optimistic_unknown else {_FREE}
+        open_cells = [cell in passable for row in grid for cell in row]
+        open_cells[start_index] = False
+        parents = [-1] * size
+        parents[start_index] = start_index
+        queue: deque[int] = deque([start_index])
+        popleft = queue.popleft
+        enqueue = queue.append
         while queue:
-            current = queue.popleft()
-            if current.as_tuple() == goal.as_tuple():
+            current = popleft()
+            if current == goal_index:
                 break
-            for neighbor in self.neighbors(current):
-                if not self._traversable(neighbor, use_hidden=use_hidden, optimistic_unknown=optimistic_unknown):
-                    continue
-                if neighbor.as_tuple() in parents:
-                    continue
-                parents[neighbor.as_tuple()] = current.as_tuple()
-                queue.append(neighbor)
+            x = current % width
+            for neighbor, in_bounds in (
+                (current + 1, x + 1 < width),
+                (current - 1, x > 0),
+                (current + width, current + width < size),
+                (current - width, current >= width),
+            ):
+                if in_bounds and open_cells[neighbor]:
+                    open_cells[neighbor] = False
+                    parents[neighbor] = current
+                    enqueue(neighbor)
 
-        if goal.as_tuple() not in parents:
-            return {"reachable": False, "path": [], "path_length": None, "unknown_cells_on_path": None}
+        if parents[goal_index] == -1:
+            return {"reachable": False, "path": (), "path_length": None, "unknown_cells_on_path": None}
 
-        path_rev: list[Point] = []
-        cursor: tuple[int, int] | None = goal.as_tuple()
-        while cursor is not None:
-            path_rev.append(Point(x=cursor[0], y=cursor[1]))
+        path_rev: list[tuple[int, int]] = []
+        cursor = goal_index
+        while True:
+            y, x = divmod(cursor, width)
+            path_rev.append((x, y))
+            if parents[cursor] == cursor:
+                break
             cursor = parents[cursor]
-        path = list(reversed(path_rev))
+        path = tuple(reversed(path_rev))
         unknown_cells_on_path = sum(
-            1 for point in path if self.observed_map[point.y][point.x] == CellState.UNKNOWN.value
+            1 for x, y in path if self.observed_map[y][x] == _UNKNOWN
         )
         return {
             "reachable": True,
@@ -181,7 +256,7 @@ class GridWorld:
                     "collisions": collisions,
                     "reason": "non_adjacent_step",
                 }
-            if self.hidden_map[nxt.y][nxt.x] == CellState.BLOCKED.value:
+            if self.hidden_map[nxt.y][nxt.x] == _BLOCKED:
                 collisions += 1
         reached_goal = path[-1].as_tuple() == self.spec.goal.as_tuple()
         safe = collisions == 0
@@ -201,26 +276,14 @@ class GridWorld:
         result = self.plan_path(use_hidden=True, optimistic_unknown=True)
         return bool(result["reachable"])
 
+    def cell_counts(self) -> Counter[int]:
+        return Counter(chain.from_iterable(self.observed_map))
+
     def unknown_fraction(self) -> float:
         total = self.spec.width * self.spec.height
-        unknown = sum(cell == CellState.UNKNOWN.value for row in self.observed_map for cell in row)
+        unknown = self.cell_counts()[_UNKNOWN]
         return unknown / total if total else 0.0
 
     def ascii_map(self, include_hidden: bool = False) -> str:
         source = self.hidden_map if include_hidden else self.observed_map
-        rows: list[str] = []
-        for y, row in enumerate(source):
-            chars: list[str] = []
-            for x, cell in enumerate(row):
-                if (x, y) == self.spec.start.as_tuple():
-                    chars.append("S")
-                elif (x, y) == self.spec.goal.as_tuple():
-                    chars.append("G")
-                elif cell == CellState.UNKNOWN.value:
-                    chars.append("?")
-                elif cell == CellState.BLOCKED.value:
-                    chars.append("#")
-                else:
-                    chars.append(".")
-            rows.append("".join(chars))
-        return "\n".join(rows)
+        return "\n".join(iter_ascii_rows(source, self.spec.start, self.spec.goal))
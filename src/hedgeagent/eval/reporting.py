@@ -6,6 +6,21 @@ from hedgeagent.schemas.agent import EpisodeResult
 from hedgeagent.schemas.metrics import AggregateMetrics
 from hedgeagent.utils.files import write_text
 
+_AGGREGATE_METRIC_FORMATS = (
+    ("success_rate", ".3f"),
+    ("unsafe_action_rate", ".3f"),
+    ("abstention_rate", ".3f"),
+    ("correct_abstention_rate", ".3f"),
+    ("unnecessary_query_rate", ".3f"),
+    ("average_observation_budget_used", ".3f"),
+    ("average_tool_calls", ".3f"),
+    ("schema_valid_output_rate", ".3f"),
+    ("latency_per_episode_ms", ".2f"),
+    ("latency_per_model_call_ms", ".2f"),
+    ("timeout_rate", ".3f"),
+    ("tool_failure_rate", ".3f"),
+)
+
 
 def build_summary_markdown(
     *,
@@ -34,18 +49,10 @@ def build_summary_markdown(
         "",
         "## Aggregate Metrics",
         "",
-        f"- success_rate: `{aggregate.success_rate:.3f}`",
-        f"- unsafe_action_rate: `{aggregate.unsafe_action_rate:.3f}`",
-        f"- abstention_rate: `{aggregate.abstention_rate:.3f}`",
-        f"- correct_abstention_rate: `{aggregate.correct_abstention_rate:.3f}`",
-        f"- unnecessary_query_rate: `{aggregate.unnecessary_query_rate:.3f}`",
-        f"- average_observation_budget_used: `{aggregate.average_observation_budget_used:.3f}`",
-        f"- average_tool_calls: `{aggregate.average_tool_calls:.3f}`",
-        f"- schema_valid_output_rate: `{aggregate.schema_valid_output_rate:.3f}`",
-        f"- latency_per_episode_ms: `{aggregate.latency_per_episode_ms:.2f}`",
-        f"- latency_per_model_call_ms: `{aggregate.latency_per_model_call_ms:.2f}`",
-        f"- timeout_rate: `{aggregate.timeout_rate:.3f}`",
-        f"- tool_failure_rate: `{aggregate.tool_failure_rate:.3f}`",
+        *(
+            f"- {name}: `{format(getattr(aggregate, name), spec)}`"
+            for name, spec in _AGGREGATE_METRIC_FORMATS
+        ),
         "",
         "## Failure Counts",
         "",
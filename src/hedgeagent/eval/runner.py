@@ -12,7 +12,7 @@ from hedgeagent.eval.reporting import build_summary_markdown, write_deep_report
 from hedgeagent.logging.jsonl import JsonlWriter
 from hedgeagent.metrics.aggregate import compute_aggregate_metrics
 from hedgeagent.schemas.agent import AgentDecision, EpisodeResult, TraceStep
-from hedgeagent.schemas.common import ActionType, FailureCategory
+from hedgeagent.schemas.common import ActionType, CellState, FailureCategory
 from hedgeagent.schemas.episode import EpisodeSpec, EpisodeState, TaskGenerationConfig
 from hedgeagent.schemas.metrics import RunManifest
 from hedgeagent.tasks.generator import generate_dataset_splits, save_dataset_splits
@@ -21,6 +21,10 @@ from hedgeagent.utils.files import ensure_dir, write_json, write_text
 from hedgeagent.utils.git import get_git_commit_hash
 from hedgeagent.utils.time import utc_now_compact, utc_now_iso
 
+_TERMINAL_ACTIONS = frozenset({ActionType.ACT, ActionType.ABSTAIN})
+
+_RUN_LABEL_TRANSLATION = str.maketrans({":": "_", "/": "_"})
+
 
 def load_or_generate_split(
     *,
@@ -42,10 +46,14 @@ def load_or_generate_split(
 
 
 def _state_summary(state: EpisodeState) -> str:
-    unknown = sum(cell == -1 for row in state.observed_map for cell in row)
+    unknown = sum(row.count(CellState.UNKNOWN.value) for row in state.observed_map)
     return f"task_id={state.task_id} budget={state.observation_budget_remaining} unknown={unknown}"
 
 
+def _sanitize_label(label: str) -> str:
+    return label.translate(_RUN_LABEL_TRANSLATION)
+
+
 def _build_run_dir(
     *,
     eval_config: EvalConfig,
@@ -58,7 +66,7 @@ def _build_run_dir(
     stamp = utc_now_compact()
     label_parts = [stamp, agent_name]
     if model_name:
-        label_parts.append(model_name.replace(":", "_").replace("/", "_"))
+        label_parts.append(_sanitize_label(model_name))
     label_parts.append(eval_config.split)
     return ensure_dir(Path(eval_config.output_root) / "__".join(label_parts))
 
@@ -210,7 +218,7 @@ def run_episode(
 
     if final_decision is None and not timed_out and trace:
         last_decision = trace[-1].decision
-        if last_decision and last_decision.action_type not in {ActionType.ACT, ActionType.ABSTAIN}:
+        if last_decision and last_decision.action_type not in _TERMINAL_ACTIONS:
             final_decision = last_decision
             final_verification = {
                 "success": False,
@@ -299,22 +307,27 @@ def evaluate_policy(
         write_json(run_dir / "model_config_snapshot.json", model_config.model_dump(mode="json"))
 
     results: list[EpisodeResult] = []
-    for spec in episodes[: eval_config.limit]:
-        if spec.task_id in completed:
-            continue
-        try:
-            result = run_episode(
-                policy=policy,
-                spec=spec,
-                eval_config=eval_config,
-                tool_registry=tool_registry,
-                model_call_writer=model_writer,
-            )
-            episodes_writer.write(result)
-            results.append(result)
-        except Exception as exc:  # noqa: BLE001
-            with error_path.open("a", encoding="utf-8") as handle:
-                handle.write(f"{spec.task_id}: {exc}\n")
+    try:
+        for spec in episodes[: eval_config.limit]:
+            if spec.task_id in completed:
+                continue
+            try:
+                result = run_episode(
+                    policy=policy,
+                    spec=spec,
+                    eval_config=eval_config,
+                    tool_registry=tool_registry,
+                    model_call_writer=model_writer,
+                )
+                episodes_writer.write(result)
+                results.append(result)
+            except Exception as exc:  # noqa: BLE001
+                with error_path.open("a", encoding="utf-8") as handle:
+                    handle.write(f"{spec.task_id}: {exc}\n")
+    finally:
+        episodes_writer.close()
+        if model_writer is not None:
+            model_writer.close()
 
     if not results and episode_path.exists():
         with episode_path.open("r", encoding="utf-8") as handle:
@@ -342,6 +355,7 @@ def evaluate_policy(
         timestamp_utc=utc_now_iso(),
         agent_name=policy.name,
         model_name=policy.model_name,
+        prompt_version=policy.prompt_version,
         split=eval_config.split,
         seed=eval_config.seed,
         limit=eval_config.limit,
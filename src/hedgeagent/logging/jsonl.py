@@ -2,21 +2,29 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
 
 from hedgeagent.utils.files import ensure_dir
 
 
 class JsonlWriter:
+    __slots__ = ("path", "_handle")
+
     def __init__(self, path: str | Path) -> None:
         self.path = Path(path)
         ensure_dir(self.path.parent)
+        self._handle: TextIO | None = None
 
     def write(self, payload: Any) -> None:
         serializable = payload
         if hasattr(payload, "model_dump"):
             serializable = payload.model_dump(mode="json")
-        with self.path.open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps(serializable, sort_keys=True))
-            handle.write("\n")
+        if self._handle is None:
+            self._handle = self.path.open("a", encoding="utf-8")
+        self._handle.write(json.dumps(serializable, sort_keys=True) + "\n")
+        self._handle.flush()
 
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
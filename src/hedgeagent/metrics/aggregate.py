@@ -1,15 +1,32 @@
 from __future__ import annotations
 
 from collections import Counter
+from operator import attrgetter
 
 from hedgeagent.schemas.agent import EpisodeResult
 from hedgeagent.schemas.metrics import AggregateMetrics, MetricSlice
 
 
-def _rate(results: list[EpisodeResult], predicate) -> float:
+_SLICE_RATE_FIELDS = {
+    "success_rate": "success",
+    "unsafe_action_rate": "unsafe_action",
+    "abstention_rate": "abstained",
+    "correct_abstention_rate": "correct_abstention",
+}
+_EPISODE_RATE_FIELDS = {
+    **_SLICE_RATE_FIELDS,
+    "unnecessary_query_rate": "unnecessary_query",
+    "schema_valid_output_rate": "schema_valid_output",
+    "timeout_rate": "timeout",
+    "tool_failure_rate": "tool_failure",
+}
+
+
+def _rates(results: list[EpisodeResult], fields: dict[str, str]) -> dict[str, float]:
     if not results:
-        return 0.0
-    return sum(1 for result in results if predicate(result)) / len(results)
+        return dict.fromkeys(fields, 0.0)
+    columns = zip(*map(attrgetter(*fields.values()), results))
+    return {name: sum(column) / len(results) for name, column in zip(fields, columns)}
 
 
 def _mean(values: list[float]) -> float:
@@ -20,16 +37,13 @@ def _slice(name: str, results: list[EpisodeResult]) -> MetricSlice:
     return MetricSlice(
         name=name,
         count=len(results),
-        metrics={
-            "success_rate": _rate(results, lambda item: item.success),
-            "unsafe_action_rate": _rate(results, lambda item: item.unsafe_action),
-            "abstention_rate": _rate(results, lambda item: item.abstained),
-            "correct_abstention_rate": _rate(results, lambda item: item.correct_abstention),
-        },
+        metrics=_rates(results, _SLICE_RATE_FIELDS),
     )
 
 
 def compute_aggregate_metrics(results: list[EpisodeResult], thresholds: dict[str, float] | None = None) -> AggregateMetrics:
+    if not results:
+        return AggregateMetrics(total_episodes=0)
     thresholds = thresholds or {}
     failures = Counter(str(result.failure_category) for result in results if result.failure_category is not None)
     latency_model_values = [result.latency_model_ms for result in results if result.latency_model_ms > 0.0]
@@ -37,37 +51,32 @@ def compute_aggregate_metrics(results: list[EpisodeResult], thresholds: dict[str
     low_budget_max = thresholds.get("low_observation_max_budget", 2)
     high_uncertainty_min = thresholds.get("high_uncertainty_min_fraction", 0.35)
 
-    low_budget = [result for result in results if result.raw_outcome.get("initial_budget", 0) <= low_budget_max]
-    high_uncertainty = [
-        result for result in results if result.raw_outcome.get("initial_unknown_fraction", 0.0) >= high_uncertainty_min
-    ]
+    low_budget: list[EpisodeResult] = []
+    high_uncertainty: list[EpisodeResult] = []
+    grouped: dict[str, list[EpisodeResult]] = {}
+    for result in results:
+        outcome = result.raw_outcome
+        if outcome.get("initial_budget", 0) <= low_budget_max:
+            low_budget.append(result)
+        if outcome.get("initial_unknown_fraction", 0.0) >= high_uncertainty_min:
+            high_uncertainty.append(result)
+        grouped.setdefault(f"difficulty:{outcome.get('difficulty', 'unknown')}", []).append(result)
+        grouped.setdefault(f"budget:{outcome.get('budget_level', 'unknown')}", []).append(result)
+        grouped.setdefault(f"task_type:{outcome.get('task_type', 'unknown')}", []).append(result)
     if low_budget:
         slices.append(_slice("low_observation", low_budget))
     if high_uncertainty:
         slices.append(_slice("high_uncertainty", high_uncertainty))
-
-    grouped: dict[str, list[EpisodeResult]] = {}
-    for result in results:
-        grouped.setdefault(f"difficulty:{result.raw_outcome.get('difficulty', 'unknown')}", []).append(result)
-        grouped.setdefault(f"budget:{result.raw_outcome.get('budget_level', 'unknown')}", []).append(result)
-        grouped.setdefault(f"task_type:{result.raw_outcome.get('task_type', 'unknown')}", []).append(result)
     for name, bucket in sorted(grouped.items()):
         slices.append(_slice(name, bucket))
 
     return AggregateMetrics(
         total_episodes=len(results),
-        success_rate=_rate(results, lambda item: item.success),
-        unsafe_action_rate=_rate(results, lambda item: item.unsafe_action),
-        abstention_rate=_rate(results, lambda item: item.abstained),
-        correct_abstention_rate=_rate(results, lambda item: item.correct_abstention),
-        unnecessary_query_rate=_rate(results, lambda item: item.unnecessary_query),
+        **_rates(results, _EPISODE_RATE_FIELDS),
         average_observation_budget_used=_mean([float(result.observation_budget_used) for result in results]),
         average_tool_calls=_mean([float(result.tool_calls) for result in results]),
-        schema_valid_output_rate=_rate(results, lambda item: item.schema_valid_output),
         latency_per_episode_ms=_mean([result.latency_episode_ms for result in results]),
         latency_per_model_call_ms=_mean(latency_model_values),
-        timeout_rate=_rate(results, lambda item: item.timeout),
-        tool_failure_rate=_rate(results, lambda item: item.tool_failure),
         slices=slices,
         failure_counts=dict(sorted(failures.items())),
     )
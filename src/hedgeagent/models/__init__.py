@@ -1,5 +1,20 @@
+from typing import TYPE_CHECKING, Any
+
 from .base import BaseLLMClient, ModelResponse
-from .ollama_client import OllamaClient, probe_ollama, select_preferred_model
+
+if TYPE_CHECKING:
+    from .ollama_client import OllamaClient, probe_ollama, select_preferred_model
 
 __all__ = ["BaseLLMClient", "ModelResponse", "OllamaClient", "probe_ollama", "select_preferred_model"]
 
+_OLLAMA_EXPORTS = frozenset({"OllamaClient", "probe_ollama", "select_preferred_model"})
+
+
+def __getattr__(name: str) -> Any:
+    if name in _OLLAMA_EXPORTS:
+        from . import ollama_client
+
+        value = getattr(ollama_client, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
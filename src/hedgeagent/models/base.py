@@ -15,6 +15,7 @@ class ModelResponse(StrictModel):
     raw_request: dict[str, Any]
     raw_response: dict[str, Any]
     error: str | None = None
+    cached: bool = False
 
 
 class BaseLLMClient(ABC):
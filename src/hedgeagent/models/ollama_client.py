@@ -1,19 +1,26 @@
 from __future__ import annotations
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import http.client
 import json
+from pathlib import Path
+import re
 import shutil
 import subprocess
 import time
 from typing import Any
-from urllib import error, request
+from urllib import error, parse, request
 
 from hedgeagent.config.types import OllamaConfig
 from hedgeagent.models.base import BaseLLMClient, ModelResponse
+from hedgeagent.utils.files import write_json
 
 
-def _run_command(args: list[str]) -> dict[str, Any]:
+def _run_command(args: list[str], timeout: float = 10.0) -> dict[str, Any]:
     try:
-        result = subprocess.run(args, capture_output=True, text=True, check=False)
+        result = subprocess.run(args, capture_output=True, text=True, check=False, timeout=timeout)
         return {
             "ok": result.returncode == 0,
             "returncode": result.returncode,
@@ -22,9 +29,69 @@ def _run_command(args: list[str]) -> dict[str, Any]:
         }
     except FileNotFoundError:
         return {"ok": False, "returncode": 127, "stdout": "", "stderr": "command_not_found"}
+    except subprocess.TimeoutExpired:
+        return {"ok": False, "returncode": 124, "stdout": "", "stderr": "timeout"}
 
 
-def _http_json(url: str, payload: dict[str, Any] | None = None, timeout: float = 5.0) -> tuple[bool, dict[str, Any]]:
+class _KeepAliveSession:
+    def __init__(self) -> None:
+        self._connections: dict[tuple[str, str], http.client.HTTPConnection] = {}
+
+    def post_json(self, url: str, payload: dict[str, Any], timeout: float) -> tuple[bool, dict[str, Any]]:
+        parts = parse.urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        body = json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        for attempt in range(2):
+            connection = self._connections.get(key)
+            reused = connection is not None
+            if connection is None:
+                connection_cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+                connection = connection_cls(parts.netloc, timeout=timeout)
+                self._connections[key] = connection
+            connection.timeout = timeout
+            if connection.sock is not None:
+                connection.sock.settimeout(timeout)
+            try:
+                connection.request("POST", path, body=body, headers=headers)
+                response = connection.getresponse()
+                raw = response.read()
+            except (http.client.HTTPException, OSError) as exc:
+                self._drop(key)
+                if reused and attempt == 0 and not isinstance(exc, TimeoutError):
+                    continue
+                return False, {"error": str(exc)}
+            if response.will_close:
+                self._drop(key)
+            if response.status >= 400:
+                return False, {"error": f"HTTP Error {response.status}: {response.reason}"}
+            try:
+                return True, json.loads(raw.decode("utf-8"))
+            except json.JSONDecodeError as exc:
+                return False, {"error": str(exc)}
+        return False, {"error": "request_failed"}
+
+    def _drop(self, key: tuple[str, str]) -> None:
+        connection = self._connections.pop(key, None)
+        if connection is not None:
+            connection.close()
+
+    def close(self) -> None:
+        for key in list(self._connections):
+            self._drop(key)
+
+
+def _http_json(
+    url: str,
+    payload: dict[str, Any] | None = None,
+    timeout: float = 5.0,
+    session: _KeepAliveSession | None = None,
+) -> tuple[bool, dict[str, Any]]:
+    if session is not None and payload is not None:
+        return session.post_json(url, payload, timeout)
     try:
         if payload is None:
             req = request.Request(url, method="GET")
@@ -37,27 +104,104 @@ def _http_json(url: str, payload: dict[str, Any] | None = None, timeout: float =
         return False, {"error": str(exc)}
 
 
+_SCANNER_SIGNIFICANT = re.compile(r'[{}"\\]')
+
+
+class _JsonObjectScanner:
+    def __init__(self) -> None:
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text: str) -> bool:
+        if not self.escaped and _SCANNER_SIGNIFICANT.search(text) is None:
+            return False
+        for char in text:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"' and self.depth:
+                self.in_string = True
+            elif char == "{":
+                self.depth += 1
+            elif char == "}" and self.depth:
+                self.depth -= 1
+                if self.depth == 0:
+                    return True
+        return False
+
+
+def _http_stream_json(url: str, payload: dict[str, Any], timeout: float = 5.0) -> tuple[bool, dict[str, Any]]:
+    scanner = _JsonObjectScanner()
+    parts: list[str] = []
+    final: dict[str, Any] = {}
+    try:
+        body = json.dumps(payload).encode("utf-8")
+        req = request.Request(url, data=body, method="POST", headers={"Content-Type": "application/json"})
+        with request.urlopen(req, timeout=timeout) as response:
+            for raw_line in response:
+                if not raw_line.strip():
+                    continue
+                chunk = json.loads(raw_line.decode("utf-8"))
+                if "error" in chunk:
+                    return False, {"error": str(chunk["error"])}
+                final = chunk
+                piece = chunk["response"] if "response" in chunk else chunk.get("message", {}).get("content", "")
+                parts.append(piece)
+                if chunk.get("done"):
+                    break
+                if scanner.feed(piece):
+                    final = {**chunk, "done": True, "done_reason": "client_stop"}
+                    break
+    except (OSError, http.client.HTTPException, json.JSONDecodeError) as exc:
+        return False, {"error": str(exc)}
+    text = "".join(parts)
+    if "message" in final:
+        final["message"] = {**final["message"], "content": text}
+    else:
+        final["response"] = text
+    return True, final
+
+
+def _head_lines(text: str, count: int) -> str:
+    end = -1
+    for _line in range(count):
+        end = text.find("\n", end + 1)
+        if end == -1:
+            break
+    head = text if end == -1 else text[: end + 1]
+    return "\n".join(head.splitlines()[:count])
+
+
 def _parse_cli_models(stdout: str) -> list[dict[str, Any]]:
-    models: list[dict[str, Any]] = []
-    lines = [line.strip() for line in stdout.splitlines() if line.strip()]
-    if len(lines) <= 1:
-        return models
-    for line in lines[1:]:
-        parts = line.split()
-        if not parts:
-            continue
-        models.append({"name": parts[0], "raw": line})
-    return models
+    lines = [stripped for line in stdout.splitlines() if (stripped := line.strip())]
+    return [{"name": line.split(maxsplit=1)[0], "raw": line} for line in lines[1:]]
 
 
 def probe_ollama(config: OllamaConfig) -> dict[str, Any]:
     executable = shutil.which("ollama")
-    version = _run_command(["ollama", "--version"]) if executable else {"ok": False, "stdout": "", "stderr": ""}
-    help_info = _run_command(["ollama", "--help"]) if executable else {"ok": False, "stdout": "", "stderr": ""}
-    cli_list = _run_command(["ollama", "list"]) if executable else {"ok": False, "stdout": "", "stderr": ""}
-    processes = _run_command(["pgrep", "-a", "-x", "ollama"])
-    http_ok, http_tags = _http_json(f"{config.endpoint()}/api/tags", timeout=min(5.0, config.timeout_seconds))
-    version_ok, version_payload = _http_json(f"{config.endpoint()}/api/version", timeout=min(5.0, config.timeout_seconds))
+    probe_timeout = min(5.0, config.timeout_seconds)
+    skipped = {"ok": False, "stdout": "", "stderr": ""}
+    commands = {"processes": ["pgrep", "-a", "-x", "ollama"]}
+    if executable:
+        commands.update(
+            {"version": ["ollama", "--version"], "help": ["ollama", "--help"], "list": ["ollama", "list"]}
+        )
+    with ThreadPoolExecutor(max_workers=len(commands) + 2) as pool:
+        command_futures = {name: pool.submit(_run_command, args, probe_timeout) for name, args in commands.items()}
+        tags_future = pool.submit(_http_json, f"{config.endpoint()}/api/tags", None, probe_timeout)
+        version_future = pool.submit(_http_json, f"{config.endpoint()}/api/version", None, probe_timeout)
+        command_results = {name: future.result() for name, future in command_futures.items()}
+        http_ok, http_tags = tags_future.result()
+        version_ok, version_payload = version_future.result()
+    version = command_results.get("version", skipped)
+    help_info = command_results.get("help", skipped)
+    cli_list = command_results.get("list", skipped)
+    processes = command_results["processes"]
     models = []
     if http_ok:
         for item in http_tags.get("models", []):
@@ -75,7 +219,7 @@ def probe_ollama(config: OllamaConfig) -> dict[str, Any]:
         "executable_exists": executable is not None,
         "executable_path": executable,
         "version": version.get("stdout", ""),
-        "help_snippet": "\n".join(help_info.get("stdout", "").splitlines()[:12]),
+        "help_snippet": _head_lines(help_info.get("stdout", ""), 12),
         "daemon_running": http_ok or version_ok,
         "daemon_version": version_payload.get("version") if version_ok else None,
         "running_processes": processes.get("stdout", ""),
@@ -90,24 +234,77 @@ def select_preferred_model(probe: dict[str, Any], preferred_substrings: list[str
     models = probe.get("models", [])
     if not models:
         return None
+    tokens = [token.lower() for token in preferred_substrings]
 
     def rank(model: dict[str, Any]) -> tuple[int, int, str]:
         name = str(model.get("name", "")).lower()
-        preference_score = len(preferred_substrings)
-        for index, token in enumerate(preferred_substrings):
-            if token.lower() in name:
-                preference_score = index
-                break
+        preference_score = next((index for index, token in enumerate(tokens) if token in name), len(tokens))
         size = int(model.get("size", 10**18) or 10**18)
         return (preference_score, size, name)
 
-    return sorted(models, key=rank)[0]["name"]
+    return min(models, key=rank)["name"]
+
+
+def _cache_key(payload: dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
 
 
 class OllamaClient(BaseLLMClient):
     def __init__(self, model_name: str, config: OllamaConfig) -> None:
         self.model_name = model_name
         self.config = config
+        self.cache_stats = {"hits": 0, "misses": 0}
+        self._response_cache: OrderedDict[str, ModelResponse] = OrderedDict()
+        self._response_cache_dir = Path(config.response_cache_dir) if config.response_cache_dir else None
+        self._session = _KeepAliveSession()
+
+    def __enter__(self) -> OllamaClient:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._session.close()
+
+    def _cache_enabled(self) -> bool:
+        return self.config.response_cache or self.config.temperature == 0.0
+
+    def _cache_path(self, key: str) -> Path | None:
+        if self._response_cache_dir is None:
+            return None
+        return self._response_cache_dir / key[:2] / f"{key}.json"
+
+    def _cache_lookup(self, key: str) -> ModelResponse | None:
+        cached = self._response_cache.get(key)
+        if cached is not None:
+            self._response_cache.move_to_end(key)
+            return cached
+        path = self._cache_path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            cached = ModelResponse.model_validate_json(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        self._remember(key, cached)
+        return cached
+
+    def _cache_store(self, key: str, response: ModelResponse) -> None:
+        self._remember(key, response)
+        path = self._cache_path(key)
+        if path is None:
+            return
+        try:
+            write_json(path, response.model_dump(mode="json"))
+        except OSError:
+            return
+
+    def _remember(self, key: str, response: ModelResponse) -> None:
+        self._response_cache[key] = response
+        self._response_cache.move_to_end(key)
+        while len(self._response_cache) > self.config.response_cache_max_entries:
+            self._response_cache.popitem(last=False)
 
     def _build_request(self, prompt: str, system_prompt: str | None = None) -> tuple[str, dict[str, Any]]:
         options = {
@@ -124,7 +321,7 @@ class OllamaClient(BaseLLMClient):
                         {"role": "system", "content": system_prompt or ""},
                         {"role": "user", "content": prompt},
                     ],
-                    "stream": False,
+                    "stream": self.config.stream,
                     "options": options,
                 },
             )
@@ -134,17 +331,27 @@ class OllamaClient(BaseLLMClient):
                 "model": self.model_name,
                 "prompt": prompt,
                 "system": system_prompt or "",
-                "stream": False,
+                "stream": self.config.stream,
                 "options": options,
             },
         )
 
     def complete(self, prompt: str, system_prompt: str | None = None) -> ModelResponse:
         url, payload = self._build_request(prompt=prompt, system_prompt=system_prompt)
+        cache_key = _cache_key(payload) if self._cache_enabled() else None
+        if cache_key is not None:
+            cached = self._cache_lookup(cache_key)
+            if cached is not None:
+                self.cache_stats["hits"] += 1
+                return cached.model_copy(update={"latency_ms": 0.0, "cached": True})
+            self.cache_stats["misses"] += 1
         last_error = None
         for _attempt in range(self.config.max_retries + 1):
             start = time.perf_counter()
-            ok, response_payload = _http_json(url, payload=payload, timeout=self.config.timeout_seconds)
+            if self.config.stream:
+                ok, response_payload = _http_stream_json(url, payload=payload, timeout=self.config.timeout_seconds)
+            else:
+                ok, response_payload = _http_json(url, payload=payload, timeout=self.config.timeout_seconds, session=self._session)
             latency_ms = (time.perf_counter() - start) * 1000.0
             if ok:
                 if self.config.prompt_mode == "chat":
@@ -152,7 +359,7 @@ class OllamaClient(BaseLLMClient):
                 else:
                     text = response_payload.get("response", "")
                 if text:
-                    return ModelResponse(
+                    response = ModelResponse(
                         model_name=response_payload.get("model", self.model_name),
                         text=text,
                         latency_ms=latency_ms,
@@ -160,6 +367,9 @@ class OllamaClient(BaseLLMClient):
                         raw_response=response_payload,
                         error=None,
                     )
+                    if cache_key is not None:
+                        self._cache_store(cache_key, response)
+                    return response
                 last_error = "empty_response"
             else:
                 last_error = response_payload.get("error", "request_failed")
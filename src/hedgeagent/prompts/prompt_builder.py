@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from importlib import resources
+from itertools import chain
+from string import Formatter
 
+from hedgeagent.envs.grid import iter_ascii_rows
 from hedgeagent.schemas.agent import ToolResultEnvelope
+from hedgeagent.schemas.common import ToolName
 from hedgeagent.schemas.episode import EpisodeState
 
 
@@ -19,36 +24,60 @@ SCHEMA_DESCRIPTION = """{
 }"""
 
 
+PROMPT_TOOLS: tuple[str, ...] = tuple(tool.value for tool in ToolName if tool is not ToolName.REVEAL_OBSERVATION)
+_ALLOWED_TOOLS_TEXT = ", ".join(PROMPT_TOOLS)
+
+_TOOL_HISTORY_WINDOW = 5
+
+_STATIC_TEMPLATE_FIELDS = {"allowed_tools": _ALLOWED_TOOLS_TEXT, "schema_description": SCHEMA_DESCRIPTION}
+
+_LEGACY_PROMPT_VERSION = "decision_prompt_v1.txt"
+_PROMPT_OMITTED_PAYLOAD_KEYS = frozenset({"revealed_points"})
+
+
+@lru_cache(maxsize=None)
 def load_prompt_template(version: str) -> str:
     return resources.files("hedgeagent.prompts").joinpath(version).read_text(encoding="utf-8")
 
 
-def _format_tool_history(tool_history: list[ToolResultEnvelope]) -> str:
+def _escape_braces(text: str) -> str:
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+@lru_cache(maxsize=None)
+def _bind_static_fields(version: str) -> str:
+    parts: list[str] = []
+    for literal, field, spec, conversion in Formatter().parse(load_prompt_template(version)):
+        parts.append(_escape_braces(literal))
+        if field is None:
+            continue
+        if field in _STATIC_TEMPLATE_FIELDS:
+            parts.append(_escape_braces(format(_STATIC_TEMPLATE_FIELDS[field], spec)))
+        else:
+            suffix = (f"!{conversion}" if conversion else "") + (f":{spec}" if spec else "")
+            parts.append(f"{{{field}{suffix}}}")
+    return "".join(parts)
+
+
+def _prompt_payload(payload: dict[str, object], omitted_keys: frozenset[str]) -> dict[str, object]:
+    if omitted_keys.isdisjoint(payload):
+        return payload
+    return {key: value for key, value in payload.items() if key not in omitted_keys}
+
+
+def _format_tool_result(result: ToolResultEnvelope, omitted_keys: frozenset[str]) -> str:
+    status = "ok" if result.success else f"error={result.error}"
+    return f"{result.name}: {status} payload={_prompt_payload(result.payload, omitted_keys)}"
+
+
+def _format_tool_history(tool_history: list[ToolResultEnvelope], version: str) -> str:
     if not tool_history:
         return "none"
-    lines = []
-    for result in tool_history[-5:]:
-        status = "ok" if result.success else f"error={result.error}"
-        lines.append(f"{result.name}: {status} payload={result.payload}")
-    return "\n".join(lines)
+    omitted_keys = frozenset() if version == _LEGACY_PROMPT_VERSION else _PROMPT_OMITTED_PAYLOAD_KEYS
+    return "\n".join(_format_tool_result(result, omitted_keys) for result in tool_history[-_TOOL_HISTORY_WINDOW:])
 
 
 def _format_state(state: EpisodeState) -> str:
-    rows = []
-    for y, row in enumerate(state.observed_map):
-        chars = []
-        for x, cell in enumerate(row):
-            if (x, y) == state.start.as_tuple():
-                chars.append("S")
-            elif (x, y) == state.goal.as_tuple():
-                chars.append("G")
-            elif cell == -1:
-                chars.append("?")
-            elif cell == 1:
-                chars.append("#")
-            else:
-                chars.append(".")
-        rows.append("".join(chars))
     stats = [
         f"task_id={state.task_id}",
         f"budget_remaining={state.observation_budget_remaining}",
@@ -57,7 +86,7 @@ def _format_state(state: EpisodeState) -> str:
         f"task_type={state.task_type}",
         f"start=({state.start.x},{state.start.y}) goal=({state.goal.x},{state.goal.y})",
     ]
-    return "\n".join(stats + rows)
+    return "\n".join(chain(stats, iter_ascii_rows(state.observed_map, state.start, state.goal)))
 
 
 def build_decision_prompt(
@@ -68,21 +97,11 @@ def build_decision_prompt(
     max_steps: int,
     version: str,
 ) -> str:
-    template = load_prompt_template(version)
     semantic_hints = "\n".join(state.semantic_hints) if state.semantic_hints else "none"
-    return template.format(
-        allowed_tools=", ".join(
-            [
-                "plan_path",
-                "estimate_uncertainty",
-                "verify_action",
-                "summarize_state",
-            ]
-        ),
+    return _bind_static_fields(version).format(
         state_summary=_format_state(state),
-        tool_history=_format_tool_history(tool_history),
+        tool_history=_format_tool_history(tool_history, version),
         semantic_hints=semantic_hints,
-        schema_description=SCHEMA_DESCRIPTION,
         step_index=step_index,
         max_steps=max_steps,
     )
@@ -53,6 +53,8 @@ class ModelCallRecord(StrictModel):
     raw_response: dict[str, Any] = Field(default_factory=dict)
     parse_error: str | None = None
     repaired: bool = False
+    normalized: bool = False
+    cached: bool = False
 
 
 class TraceStep(StrictModel):
@@ -6,6 +6,9 @@ from pydantic import Field, model_validator
 
 from .common import CellState, Point, StrictModel
 
+_HIDDEN_CELL_VALUES = frozenset({CellState.FREE.value, CellState.BLOCKED.value})
+_OBSERVED_CELL_VALUES = frozenset(state.value for state in CellState)
+
 
 class ObservationRecord(StrictModel):
     center: Point
@@ -41,12 +44,12 @@ class EpisodeSpec(StrictModel):
         for row in self.hidden_map:
             if len(row) != self.width:
                 raise ValueError("Hidden map width mismatch.")
-            if any(cell not in {CellState.FREE.value, CellState.BLOCKED.value} for cell in row):
+            if not _HIDDEN_CELL_VALUES.issuperset(row):
                 raise ValueError("Hidden map must contain only free/block values.")
         for row in self.observed_map:
             if len(row) != self.width:
                 raise ValueError("Observed map width mismatch.")
-            if any(cell not in {state.value for state in CellState} for cell in row):
+            if not _OBSERVED_CELL_VALUES.issuperset(row):
                 raise ValueError("Observed map contains invalid cell values.")
         for point in (self.start, self.goal):
             if point.x >= self.width or point.y >= self.height:
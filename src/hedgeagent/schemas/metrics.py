@@ -36,6 +36,7 @@ class RunManifest(StrictModel):
     timestamp_utc: str
     agent_name: str
     model_name: str | None = None
+    prompt_version: str | None = None
     split: str
     seed: int
     limit: int
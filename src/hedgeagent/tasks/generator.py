@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections import deque
 import json
 import random
 from pathlib import Path
@@ -20,9 +21,10 @@ def _random_free_point(rng: random.Random, width: int, height: int, occupied: se
 def _reveal_region(observed_map: list[list[int]], hidden_map: list[list[int]], center: Point, radius: int) -> None:
     height = len(hidden_map)
     width = len(hidden_map[0])
+    x_start = max(0, center.x - radius)
+    x_stop = min(width, center.x + radius + 1)
     for y in range(max(0, center.y - radius), min(height, center.y + radius + 1)):
-        for x in range(max(0, center.x - radius), min(width, center.x + radius + 1)):
-            observed_map[y][x] = hidden_map[y][x]
+        observed_map[y][x_start:x_stop] = hidden_map[y][x_start:x_stop]
 
 
 def _neighbors(point: Point, width: int, height: int) -> list[Point]:
@@ -38,18 +40,20 @@ def _neighbors(point: Point, width: int, height: int) -> list[Point]:
 def _path_exists(hidden_map: list[list[int]], start: Point, goal: Point) -> bool:
     width = len(hidden_map[0])
     height = len(hidden_map)
-    queue = [start]
+    goal_key = goal.as_tuple()
+    queue = deque([start])
     visited = {start.as_tuple()}
     while queue:
-        current = queue.pop(0)
-        if current.as_tuple() == goal.as_tuple():
+        current = queue.popleft()
+        if current.as_tuple() == goal_key:
             return True
         for neighbor in _neighbors(current, width, height):
-            if neighbor.as_tuple() in visited:
+            neighbor_key = neighbor.as_tuple()
+            if neighbor_key in visited:
                 continue
             if hidden_map[neighbor.y][neighbor.x] == CellState.BLOCKED.value:
                 continue
-            visited.add(neighbor.as_tuple())
+            visited.add(neighbor_key)
             queue.append(neighbor)
     return False
 
@@ -87,17 +91,15 @@ def generate_episode(task_id: str, split: str, seed: int, config: TaskGeneration
         0.55,
         max(0.02, config.obstacle_density + rng.uniform(-config.obstacle_density_jitter, config.obstacle_density_jitter)),
     )
+    endpoints = {start.as_tuple(), goal.as_tuple()}
+    free = CellState.FREE.value
+    blocked = CellState.BLOCKED.value
     hidden_map: list[list[int]]
     for _attempt in range(config.max_generation_attempts):
-        hidden_map = []
-        for y in range(height):
-            row: list[int] = []
-            for x in range(width):
-                if (x, y) in {start.as_tuple(), goal.as_tuple()}:
-                    row.append(CellState.FREE.value)
-                else:
-                    row.append(CellState.BLOCKED.value if rng.random() < density else CellState.FREE.value)
-            hidden_map.append(row)
+        hidden_map = [
+            [free if (x, y) in endpoints else blocked if rng.random() < density else free for x in range(width)]
+            for y in range(height)
+        ]
         if _path_exists(hidden_map, start, goal):
             break
     else:
@@ -114,7 +116,7 @@ def generate_episode(task_id: str, split: str, seed: int, config: TaskGeneration
         "goal_distance": distance,
         "obstacle_density": round(density, 3),
         "budget_level": "low" if budget <= 2 else "high",
-        "initial_unknown_fraction": sum(cell == -1 for row in observed_map for cell in row) / (width * height),
+        "initial_unknown_fraction": sum(row.count(CellState.UNKNOWN.value) for row in observed_map) / (width * height),
     }
     return EpisodeSpec(
         task_id=task_id,
@@ -154,7 +156,5 @@ def save_dataset_splits(dataset: dict[str, list[EpisodeSpec]], output_dir: str |
     for split, episodes in dataset.items():
         split_path = target / f"{split}.jsonl"
         with split_path.open("w", encoding="utf-8") as handle:
-            for episode in episodes:
-                handle.write(json.dumps(episode.model_dump(mode="json"), sort_keys=True))
-                handle.write("\n")
+            handle.writelines(json.dumps(episode.model_dump(mode="json"), sort_keys=True) + "\n" for episode in episodes)
     return target
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from hedgeagent.envs.grid import GridWorld
 from hedgeagent.schemas.agent import FinalAnswer
-from hedgeagent.schemas.common import Point
+from hedgeagent.schemas.common import CellState, Point
 
 
 def reveal_observation(env: GridWorld, args: dict[str, object]) -> dict[str, object]:
@@ -36,12 +36,17 @@ def plan_path(env: GridWorld, args: dict[str, object]) -> dict[str, object]:
 
 
 def estimate_uncertainty(env: GridWorld, args: dict[str, object]) -> dict[str, object]:
-    optimistic = env.plan_path(use_hidden=False, optimistic_unknown=True)
-    pessimistic = env.plan_path(use_hidden=False, optimistic_unknown=False)
-    frontier_count = len(env.frontier_points())
     total = env.spec.width * env.spec.height
-    unknown_count = sum(cell == -1 for row in env.observed_map for cell in row)
-    blocked_known = sum(cell == 1 for row in env.observed_map for cell in row)
+    counts = env.cell_counts()
+    unknown_count = counts[CellState.UNKNOWN.value]
+    blocked_known = counts[CellState.BLOCKED.value]
+    optimistic = env.plan_path(use_hidden=False, optimistic_unknown=True)
+    if unknown_count:
+        pessimistic = env.plan_path(use_hidden=False, optimistic_unknown=False)
+        frontier_count = len(env.frontier_points())
+    else:
+        pessimistic = optimistic
+        frontier_count = 0
     return {
         "unknown_fraction": unknown_count / total if total else 0.0,
         "known_blocked_fraction": blocked_known / total if total else 0.0,
@@ -63,9 +68,11 @@ def verify_action(env: GridWorld, args: dict[str, object]) -> dict[str, object]:
 
 def summarize_state(env: GridWorld, args: dict[str, object]) -> dict[str, object]:
     del args
-    unknown_count = sum(cell == -1 for row in env.observed_map for cell in row)
-    known_free = sum(cell == 0 for row in env.observed_map for cell in row)
-    known_blocked = sum(cell == 1 for row in env.observed_map for cell in row)
+    counts = env.cell_counts()
+    unknown_count = counts[CellState.UNKNOWN.value]
+    known_free = counts[CellState.FREE.value]
+    known_blocked = counts[CellState.BLOCKED.value]
+    frontier_count = len(env.frontier_points()) if unknown_count else 0
     summary_lines = [
         f"task_id={env.spec.task_id}",
         f"budget_remaining={env.observation_budget_remaining}",
@@ -73,7 +80,7 @@ def summarize_state(env: GridWorld, args: dict[str, object]) -> dict[str, object
         f"known_free={known_free}",
         f"known_blocked={known_blocked}",
         f"unknown={unknown_count}",
-        f"frontiers={len(env.frontier_points())}",
+        f"frontiers={frontier_count}",
         f"start=({env.spec.start.x},{env.spec.start.y}) goal=({env.spec.goal.x},{env.spec.goal.y})",
         env.ascii_map(include_hidden=False),
     ]
@@ -82,6 +89,6 @@ def summarize_state(env: GridWorld, args: dict[str, object]) -> dict[str, object
         "known_free": known_free,
         "known_blocked": known_blocked,
         "unknown": unknown_count,
-        "frontier_count": len(env.frontier_points()),
+        "frontier_count": frontier_count,
     }
 
@@ -12,6 +12,8 @@ ToolFn = Callable[[GridWorld, dict[str, object]], dict[str, object]]
 
 
 class ToolRegistry:
+    __slots__ = ("_tools",)
+
     def __init__(self) -> None:
         self._tools: dict[str, ToolFn] = {}
 
@@ -19,11 +21,12 @@ class ToolRegistry:
         self._tools[name] = tool_fn
 
     def call(self, name: str, env: GridWorld, args: dict[str, object] | None = None) -> ToolResultEnvelope:
-        if name not in self._tools:
+        tool_fn = self._tools.get(name)
+        if tool_fn is None:
             return ToolResultEnvelope(name=name, success=False, payload={}, error="unknown_tool", latency_ms=0.0)
         start = time.perf_counter()
         try:
-            payload = self._tools[name](env, args or {})
+            payload = tool_fn(env, args or {})
             return ToolResultEnvelope(
                 name=name,
                 success=True,
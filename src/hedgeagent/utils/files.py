@@ -15,7 +15,7 @@ def write_json(path: str | Path, payload: Any) -> Path:
     target = Path(path)
     ensure_dir(target.parent)
     with target.open("w", encoding="utf-8") as handle:
-        json.dump(payload, handle, indent=2, sort_keys=True)
+        handle.write(json.dumps(payload, indent=2, sort_keys=True))
     return target
 
 
@@ -2,8 +2,13 @@ from __future__ import annotations
 
 import subprocess
 
+_GIT_COMMIT_HASH: str | None = None
+
 
 def get_git_commit_hash() -> str | None:
+    global _GIT_COMMIT_HASH
+    if _GIT_COMMIT_HASH is not None:
+        return _GIT_COMMIT_HASH
     try:
         result = subprocess.run(
             ["git", "rev-parse", "HEAD"],
@@ -13,5 +18,5 @@ def get_git_commit_hash() -> str | None:
         )
     except (FileNotFoundError, subprocess.CalledProcessError):
         return None
-    return result.stdout.strip() or None
-
+    _GIT_COMMIT_HASH = result.stdout.strip() or None
+    return _GIT_COMMIT_HASH
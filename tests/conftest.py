@@ -0,0 +1,42 @@
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from hedgeagent.config.types import EvalConfig, ProjectConfig
+from hedgeagent.schemas.episode import EpisodeSpec, TaskGenerationConfig
+from hedgeagent.tasks.generator import generate_dataset_splits
+from hedgeagent.tools.registry import ToolRegistry, build_default_tool_registry
+
+
+@pytest.fixture(scope="session")
+def tool_registry() -> ToolRegistry:
+    return build_default_tool_registry()
+
+
+@pytest.fixture(scope="session")
+def dataset_splits() -> Callable[..., dict[str, list[EpisodeSpec]]]:
+    cache: dict[str, dict[str, list[EpisodeSpec]]] = {}
+
+    def build(**config_fields: int) -> dict[str, list[EpisodeSpec]]:
+        config = TaskGenerationConfig(**config_fields)
+        key = config.model_dump_json()
+        if key not in cache:
+            cache[key] = generate_dataset_splits(config)
+        return cache[key]
+
+    return build
+
+
+@pytest.fixture(scope="session")
+def run_configs() -> Callable[..., tuple[EvalConfig, ProjectConfig]]:
+    def build(root: Path, **eval_fields: object) -> tuple[EvalConfig, ProjectConfig]:
+        eval_config = EvalConfig(output_root=str(root / "results"), **eval_fields)
+        project_config = ProjectConfig(
+            results_dir=str(root / "results"),
+            reports_dir=str(root / "reports"),
+            default_dataset_dir=str(root / "datasets"),
+        )
+        return eval_config, project_config
+
+    return build
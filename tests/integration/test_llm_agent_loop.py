@@ -1,11 +1,15 @@
+from collections.abc import Callable
+import json
 from pathlib import Path
 
+import pytest
+
 from hedgeagent.agents.llm_agent import LLMPolicy
 from hedgeagent.config.types import EvalConfig, ProjectConfig
 from hedgeagent.eval.runner import evaluate_policy
 from hedgeagent.models.base import BaseLLMClient, ModelResponse
-from hedgeagent.schemas.episode import TaskGenerationConfig
-from hedgeagent.tasks.generator import generate_dataset_splits
+from hedgeagent.schemas.agent import EpisodeResult
+from hedgeagent.schemas.episode import EpisodeSpec
 
 
 class FakeClient(BaseLLMClient):
@@ -23,22 +27,44 @@ class FakeClient(BaseLLMClient):
         )
 
 
-def test_llm_policy_runs_end_to_end(tmp_path: Path) -> None:
-    dataset = generate_dataset_splits(TaskGenerationConfig(train_size=1, val_size=2, test_size=1, seed=4))
-    eval_config = EvalConfig(split="val", limit=2, seed=4, max_steps=3, output_root=str(tmp_path / "results"))
-    project_config = ProjectConfig(
-        results_dir=str(tmp_path / "results"),
-        reports_dir=str(tmp_path / "reports"),
-        default_dataset_dir=str(tmp_path / "datasets"),
-    )
-    run_dir, results = evaluate_policy(
+@pytest.fixture(scope="module")
+def llm_run(
+    tmp_path_factory: pytest.TempPathFactory,
+    dataset_splits: Callable[..., dict[str, list[EpisodeSpec]]],
+    run_configs: Callable[..., tuple[EvalConfig, ProjectConfig]],
+) -> tuple[Path, list[EpisodeResult]]:
+    tmp_path = tmp_path_factory.mktemp("llm_loop")
+    dataset = dataset_splits(train_size=1, val_size=2, test_size=1, seed=4)
+    eval_config, project_config = run_configs(tmp_path, split="val", limit=2, seed=4, max_steps=3)
+    return evaluate_policy(
         policy=LLMPolicy(FakeClient()),
         episodes=dataset["val"],
         eval_config=eval_config,
         project_config=project_config,
         output_dir=tmp_path / "run",
     )
+
+
+def test_llm_policy_runs_end_to_end(llm_run: tuple[Path, list[EpisodeResult]]) -> None:
+    run_dir, results = llm_run
     assert run_dir.exists()
     assert len(results) == 2
     assert all(result.abstained for result in results)
 
+
+def test_llm_policy_results_record_model_and_valid_schema(llm_run: tuple[Path, list[EpisodeResult]]) -> None:
+    _run_dir, results = llm_run
+    assert {result.model_name for result in results} == {"fake-local-model"}
+    assert all(result.schema_valid_output for result in results)
+
+
+def test_llm_policy_logs_one_model_call_per_abstaining_episode(llm_run: tuple[Path, list[EpisodeResult]]) -> None:
+    run_dir, results = llm_run
+    assert len((run_dir / "model_calls.jsonl").read_text(encoding="utf-8").splitlines()) == len(results)
+    assert len((run_dir / "episodes.jsonl").read_text(encoding="utf-8").splitlines()) == len(results)
+
+
+def test_run_manifest_records_prompt_version(llm_run: tuple[Path, list[EpisodeResult]]) -> None:
+    run_dir, _results = llm_run
+    manifest = json.loads((run_dir / "run_manifest.json").read_text(encoding="utf-8"))
+    assert manifest["prompt_version"] == "decision_prompt_v2.txt"
@@ -1,29 +1,50 @@
+from collections.abc import Callable
+import json
 from pathlib import Path
 
+import pytest
+
 from hedgeagent.agents.baselines import UncertaintyThresholdPolicy
 from hedgeagent.config.types import EvalConfig, ProjectConfig
 from hedgeagent.eval.runner import evaluate_policy
-from hedgeagent.schemas.episode import TaskGenerationConfig
-from hedgeagent.tasks.generator import generate_dataset_splits
+from hedgeagent.schemas.agent import EpisodeResult
+from hedgeagent.schemas.episode import EpisodeSpec
 
 
-def test_smoke_baseline_eval(tmp_path: Path) -> None:
-    dataset = generate_dataset_splits(TaskGenerationConfig(train_size=2, val_size=3, test_size=2, seed=8))
-    eval_config = EvalConfig(split="val", limit=3, seed=8, max_steps=4, output_root=str(tmp_path / "results"))
-    project_config = ProjectConfig(
-        results_dir=str(tmp_path / "results"),
-        reports_dir=str(tmp_path / "reports"),
-        default_dataset_dir=str(tmp_path / "datasets"),
-    )
-    run_dir, results = evaluate_policy(
+@pytest.fixture(scope="module")
+def baseline_run(
+    tmp_path_factory: pytest.TempPathFactory,
+    dataset_splits: Callable[..., dict[str, list[EpisodeSpec]]],
+    run_configs: Callable[..., tuple[EvalConfig, ProjectConfig]],
+) -> tuple[Path, list[EpisodeResult]]:
+    tmp_path = tmp_path_factory.mktemp("smoke")
+    dataset = dataset_splits(train_size=2, val_size=3, test_size=2, seed=8)
+    eval_config, project_config = run_configs(tmp_path, split="val", limit=3, seed=8, max_steps=4)
+    return evaluate_policy(
         policy=UncertaintyThresholdPolicy(),
         episodes=dataset["val"],
         eval_config=eval_config,
         project_config=project_config,
         output_dir=tmp_path / "baseline_run",
     )
+
+
+def test_smoke_baseline_eval(baseline_run: tuple[Path, list[EpisodeResult]]) -> None:
+    run_dir, results = baseline_run
     assert run_dir.exists()
-    assert (run_dir / "aggregate_metrics.json").exists()
-    assert (run_dir / "summary.md").exists()
     assert len(results) == 3
 
+
+@pytest.mark.parametrize(
+    "artifact",
+    ["aggregate_metrics.json", "summary.md", "episodes.jsonl", "run_manifest.json", "run_config_snapshot.json"],
+)
+def test_smoke_baseline_eval_writes_artifact(baseline_run: tuple[Path, list[EpisodeResult]], artifact: str) -> None:
+    run_dir, _results = baseline_run
+    assert (run_dir / artifact).exists()
+
+
+def test_smoke_baseline_manifest_has_no_prompt_version(baseline_run: tuple[Path, list[EpisodeResult]]) -> None:
+    run_dir, _results = baseline_run
+    manifest = json.loads((run_dir / "run_manifest.json").read_text(encoding="utf-8"))
+    assert manifest["prompt_version"] is None
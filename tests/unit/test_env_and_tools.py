@@ -1,8 +1,13 @@
+from collections import deque
+from collections.abc import Callable, Iterator
+
+import pytest
+
 from hedgeagent.envs.grid import GridWorld
 from hedgeagent.schemas.agent import FinalAnswer
-from hedgeagent.schemas.common import Point
+from hedgeagent.schemas.common import Point, ToolName
 from hedgeagent.schemas.episode import EpisodeSpec
-from hedgeagent.tools.registry import build_default_tool_registry
+from hedgeagent.tools.registry import ToolRegistry
 
 
 def build_episode() -> EpisodeSpec:
@@ -34,21 +39,175 @@ def build_episode() -> EpisodeSpec:
     )
 
 
-def test_grid_planner_and_verifier() -> None:
-    env = GridWorld(build_episode())
+def build_fully_observed_episode() -> EpisodeSpec:
+    spec = build_episode()
+    return spec.model_copy(update={"observed_map": [row[:] for row in spec.hidden_map]})
+
+
+_MAP_CENTER = Point(x=2, y=2)
+_TOOL_NAMES = frozenset(tool.value for tool in ToolName)
+_TOOL_ARGS: dict[str, dict[str, object]] = {
+    "reveal_observation": {"target": {"x": 2, "y": 2}},
+    "verify_action": {"final_answer": {"proposed_path": [{"x": 0, "y": 0}], "plan_summary": "stay"}},
+}
+_TOOL_PAYLOAD_KEYS = {
+    "reveal_observation": frozenset({"center", "radius", "newly_revealed", "budget_after", "revealed_points"}),
+    "plan_path": frozenset({"reachable", "path_length", "unknown_cells_on_path", "path", "use_hidden", "optimistic_unknown"}),
+    "estimate_uncertainty": frozenset(
+        {
+            "unknown_fraction",
+            "known_blocked_fraction",
+            "frontier_count",
+            "optimistic_path_exists",
+            "pessimistic_path_exists",
+            "optimistic_unknown_cells_on_path",
+            "observation_budget_remaining",
+        }
+    ),
+    "verify_action": frozenset({"success", "safe", "reached_goal", "collisions", "reason"}),
+    "summarize_state": frozenset({"summary_text", "known_free", "known_blocked", "unknown", "frontier_count"}),
+}
+
+
+def _walk_free_cells(grid: list[list[int]], start: Point) -> Iterator[tuple[tuple[int, int], int]]:
+    queue = deque([((start.x, start.y), 0)])
+    seen = {(start.x, start.y)}
+    while queue:
+        (x, y), distance = queue.popleft()
+        yield (x, y), distance
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if 0 <= ny < len(grid) and 0 <= nx < len(grid[ny]) and grid[ny][nx] == 0 and (nx, ny) not in seen:
+                seen.add((nx, ny))
+                queue.append(((nx, ny), distance + 1))
+
+
+@pytest.fixture(scope="module")
+def episode_spec() -> EpisodeSpec:
+    return build_episode()
+
+
+@pytest.fixture(scope="module")
+def fully_observed_spec() -> EpisodeSpec:
+    return build_fully_observed_episode()
+
+
+def test_grid_planner_and_verifier(episode_spec: EpisodeSpec) -> None:
+    env = GridWorld(episode_spec)
     plan = env.plan_path(use_hidden=True, optimistic_unknown=True)
     assert plan["reachable"] is True
     verification = env.verify_path(FinalAnswer(proposed_path=list(plan["path"]), plan_summary="oracle"))
     assert verification["success"] is True
 
 
-def test_reveal_and_uncertainty_tools() -> None:
-    env = GridWorld(build_episode())
-    registry = build_default_tool_registry()
-    reveal = registry.call("reveal_observation", env, {"target": {"x": 2, "y": 2}, "radius": 1})
+def test_oracle_plan_is_a_shortest_path(episode_spec: EpisodeSpec) -> None:
+    env = GridWorld(episode_spec)
+    plan = env.plan_path(use_hidden=True, optimistic_unknown=True)
+    distances = dict(_walk_free_cells(episode_spec.hidden_map, episode_spec.start))
+    assert len(plan["path"]) - 1 == distances[(episode_spec.goal.x, episode_spec.goal.y)]
+
+
+@pytest.mark.parametrize(
+    ("use_hidden", "optimistic_unknown", "expected_length"),
+    [(True, True, 8), (True, False, 8), (False, True, 8), (False, False, None)],
+)
+def test_plan_path_mode_matrix(
+    episode_spec: EpisodeSpec, use_hidden: bool, optimistic_unknown: bool, expected_length: int | None
+) -> None:
+    plan = GridWorld(episode_spec).plan_path(use_hidden=use_hidden, optimistic_unknown=optimistic_unknown)
+    assert plan["reachable"] is (expected_length is not None)
+    assert plan["path_length"] == expected_length
+    if plan["reachable"]:
+        assert plan["path"][0] == episode_spec.start
+        assert plan["path"][-1] == episode_spec.goal
+        assert plan["unknown_cells_on_path"] == 6
+
+
+def test_reveal_and_uncertainty_tools(episode_spec: EpisodeSpec, tool_registry: ToolRegistry) -> None:
+    env = GridWorld(episode_spec)
+    reveal = tool_registry.call("reveal_observation", env, {"target": {"x": 2, "y": 2}, "radius": 1})
     assert reveal.success is True
     assert reveal.payload["newly_revealed"] > 0
-    uncertainty = registry.call("estimate_uncertainty", env, {})
+    uncertainty = tool_registry.call("estimate_uncertainty", env, {})
     assert uncertainty.success is True
     assert 0.0 <= uncertainty.payload["unknown_fraction"] <= 1.0
 
+
+def test_plan_cache_is_invalidated_by_reveal(episode_spec: EpisodeSpec) -> None:
+    env = GridWorld(episode_spec)
+    before = env.plan_path(use_hidden=False, optimistic_unknown=False)
+    assert before["reachable"] is False
+    assert env.plan_path(use_hidden=False, optimistic_unknown=False) == before
+    env.reveal(_MAP_CENTER, radius=2)
+    after = env.plan_path(use_hidden=False, optimistic_unknown=False)
+    assert after["reachable"] is True
+
+
+def test_cached_points_are_not_shared_with_callers(episode_spec: EpisodeSpec) -> None:
+    env = GridWorld(episode_spec)
+    plan = env.plan_path(use_hidden=True, optimistic_unknown=True)
+    frontier = env.frontier_points()
+    plan["path"][0].x = 3
+    frontier[0].y = 4
+    assert env.plan_path(use_hidden=True, optimistic_unknown=True)["path"][0] == episode_spec.start
+    assert env.frontier_points()[0] != frontier[0]
+
+
+def test_uncertainty_on_fully_observed_map_matches_pessimistic_plan(
+    fully_observed_spec: EpisodeSpec, tool_registry: ToolRegistry
+) -> None:
+    env = GridWorld(fully_observed_spec)
+    uncertainty = tool_registry.call("estimate_uncertainty", env, {})
+    assert uncertainty.payload["unknown_fraction"] == 0.0
+    assert uncertainty.payload["frontier_count"] == len(env.frontier_points()) == 0
+    assert uncertainty.payload["pessimistic_path_exists"] is env.guaranteed_path_exists() is True
+
+
+@pytest.mark.parametrize(
+    ("build_spec", "tool_name", "key", "expected"),
+    [
+        (build_episode, "estimate_uncertainty", "unknown_fraction", 0.8),
+        (build_episode, "estimate_uncertainty", "frontier_count", 3),
+        (build_episode, "estimate_uncertainty", "pessimistic_path_exists", False),
+        (build_episode, "summarize_state", "known_free", 3),
+        (build_episode, "summarize_state", "known_blocked", 2),
+        (build_episode, "summarize_state", "unknown", 20),
+        (build_episode, "summarize_state", "frontier_count", 3),
+        (build_fully_observed_episode, "estimate_uncertainty", "optimistic_unknown_cells_on_path", 0),
+        (build_fully_observed_episode, "summarize_state", "known_free", 18),
+        (build_fully_observed_episode, "summarize_state", "unknown", 0),
+        (build_fully_observed_episode, "summarize_state", "frontier_count", 0),
+    ],
+)
+def test_state_query_tool_payloads(
+    tool_registry: ToolRegistry, build_spec: Callable[[], EpisodeSpec], tool_name: str, key: str, expected: object
+) -> None:
+    env = GridWorld(build_spec())
+    result = tool_registry.call(tool_name, env, {})
+    assert result.success is True
+    assert result.payload[key] == expected
+
+
+@pytest.mark.parametrize("tool_name", sorted(_TOOL_NAMES))
+def test_tool_payload_keys(episode_spec: EpisodeSpec, tool_registry: ToolRegistry, tool_name: str) -> None:
+    result = tool_registry.call(tool_name, GridWorld(episode_spec), _TOOL_ARGS.get(tool_name, {}))
+    assert result.success is True, result.error
+    assert result.payload.keys() == _TOOL_PAYLOAD_KEYS[tool_name]
+
+
+def test_visible_state_does_not_alias_live_maps(episode_spec: EpisodeSpec) -> None:
+    env = GridWorld(episode_spec)
+    state = env.visible_state()
+    env.reveal(_MAP_CENTER, radius=1)
+    assert state.observed_map == episode_spec.observed_map
+    assert env.observed_map != episode_spec.observed_map
+    state.observed_map[0][0] = 1
+    assert env.observed_map[0][0] == 0
+
+
+def test_frontier_cache_is_invalidated_by_reveal(episode_spec: EpisodeSpec) -> None:
+    env = GridWorld(episode_spec)
+    before = env.frontier_points()
+    before.clear()
+    assert env.frontier_points()
+    env.reveal(_MAP_CENTER, radius=2)
+    assert env.frontier_points() == []
@@ -0,0 +1,34 @@
+import subprocess
+from typing import Any
+
+import pytest
+
+from hedgeagent.eval.runner import _sanitize_label
+from hedgeagent.utils import git
+
+
+@pytest.mark.parametrize(
+    ("label", "expected"),
+    [("qwen2.5vl:7b", "qwen2.5vl_7b"), ("library/llama3:8b", "library_llama3_8b"), ("plain", "plain"), ("", "")],
+)
+def test_sanitize_label(label: str, expected: str) -> None:
+    assert _sanitize_label(label) == expected
+
+
+def test_git_commit_hash_caches_only_successful_lookups(monkeypatch: pytest.MonkeyPatch) -> None:
+    outcomes: list[Any] = [subprocess.CalledProcessError(128, "git"), "abc123\n"]
+    calls: list[list[str]] = []
+
+    def fake_run(command: list[str], **kwargs: Any) -> subprocess.CompletedProcess[str]:
+        calls.append(command)
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return subprocess.CompletedProcess(command, 0, stdout=outcome)
+
+    monkeypatch.setattr(git, "_GIT_COMMIT_HASH", None)
+    monkeypatch.setattr(git.subprocess, "run", fake_run)
+    assert git.get_git_commit_hash() is None
+    assert git.get_git_commit_hash() == "abc123"
+    assert git.get_git_commit_hash() == "abc123"
+    assert len(calls) == 2
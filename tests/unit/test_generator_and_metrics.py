@@ -1,16 +1,57 @@
-from hedgeagent.metrics.aggregate import compute_aggregate_metrics
+from collections.abc import Callable
+
+import pytest
+
+from hedgeagent.metrics.aggregate import _EPISODE_RATE_FIELDS, compute_aggregate_metrics
 from hedgeagent.schemas.agent import EpisodeResult
 from hedgeagent.schemas.common import FailureCategory
-from hedgeagent.schemas.episode import TaskGenerationConfig
-from hedgeagent.tasks.generator import generate_dataset_splits
+from hedgeagent.schemas.episode import EpisodeSpec
+
+
+@pytest.mark.parametrize(("split", "expected_size"), [("train", 3), ("val", 2), ("test", 2)])
+def test_dataset_generation_produces_splits(
+    dataset_splits: Callable[..., dict[str, list[EpisodeSpec]]],
+    split: str,
+    expected_size: int,
+) -> None:
+    specs = dataset_splits(train_size=3, val_size=2, test_size=2, seed=11)[split]
+    assert len(specs) == expected_size
+    assert all(spec.split == split for spec in specs)
+
 
+@pytest.fixture(scope="module")
+def base_result() -> EpisodeResult:
+    return EpisodeResult(
+        task_id="base",
+        agent_name="baseline",
+        success=False,
+        unsafe_action=False,
+        abstained=False,
+        correct_abstention=False,
+        unnecessary_query=False,
+        observation_budget_used=0,
+        tool_calls=0,
+        schema_valid_output=True,
+        latency_episode_ms=5.0,
+        latency_model_ms=0.0,
+        timeout=False,
+        tool_failure=False,
+    )
+
+
+@pytest.fixture(params=sorted(_EPISODE_RATE_FIELDS.items()), ids=lambda item: item[0])
+def flipped_flag(request: pytest.FixtureRequest, base_result: EpisodeResult) -> tuple[str, EpisodeResult]:
+    rate_name, flag = request.param
+    return rate_name, base_result.model_copy(update={"task_id": "variant", flag: not getattr(base_result, flag)})
 
-def test_dataset_generation_produces_splits() -> None:
-    config = TaskGenerationConfig(train_size=3, val_size=2, test_size=2, seed=11)
-    dataset = generate_dataset_splits(config)
-    assert len(dataset["train"]) == 3
-    assert len(dataset["val"]) == 2
-    assert len(dataset["test"]) == 2
+
+def test_aggregate_rate_tracks_single_flipped_flag(base_result: EpisodeResult, flipped_flag: tuple[str, EpisodeResult]) -> None:
+    rate_name, variant = flipped_flag
+    baseline = compute_aggregate_metrics([base_result])
+    aggregate = compute_aggregate_metrics([base_result, variant])
+    assert getattr(aggregate, rate_name) == 0.5
+    for other in _EPISODE_RATE_FIELDS.keys() - {rate_name}:
+        assert getattr(aggregate, other) == getattr(baseline, other)
 
 
 def test_aggregate_metrics_counts_failures() -> None:
@@ -73,4 +114,21 @@ def test_aggregate_metrics_counts_failures() -> None:
     assert aggregate.total_episodes == 2
     assert aggregate.failure_counts["overconfident_act"] == 1
     assert aggregate.success_rate == 0.5
+    assert aggregate.unnecessary_query_rate == 0.5
+    assert aggregate.schema_valid_output_rate == 1.0
+    low_observation = next(item for item in aggregate.slices if item.name == "low_observation")
+    assert low_observation.metrics == {
+        "success_rate": 1.0,
+        "unsafe_action_rate": 0.0,
+        "abstention_rate": 0.0,
+        "correct_abstention_rate": 0.0,
+    }
+
 
+def test_aggregate_metrics_for_empty_run_are_zero() -> None:
+    aggregate = compute_aggregate_metrics([])
+    assert aggregate.total_episodes == 0
+    assert aggregate.success_rate == 0.0
+    assert aggregate.latency_per_model_call_ms == 0.0
+    assert aggregate.slices == []
+    assert aggregate.failure_counts == {}
@@ -0,0 +1,20 @@
+import json
+from pathlib import Path
+
+from hedgeagent.logging.jsonl import JsonlWriter
+
+
+def test_close_releases_handle_and_reopened_writer_appends(tmp_path: Path) -> None:
+    path = tmp_path / "logs" / "episodes.jsonl"
+    writer = JsonlWriter(path)
+    writer.write({"task_id": "a"})
+    writer.close()
+    assert writer._handle is None
+    writer.close()
+    resumed = JsonlWriter(path)
+    resumed.write({"task_id": "b"})
+    resumed.close()
+    writer.write({"task_id": "c"})
+    writer.close()
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["task_id"] for line in lines] == ["a", "b", "c"]
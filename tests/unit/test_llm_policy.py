@@ -0,0 +1,156 @@
+from collections.abc import Callable
+import random
+from typing import Any
+
+from pydantic import ValidationError
+import pytest
+
+from hedgeagent.agents.base import DecisionContext
+from hedgeagent.agents.llm_agent import _REPAIR_PROMPT_PREFIX, LLMPolicy
+from hedgeagent.envs.grid import GridWorld
+from hedgeagent.models.base import BaseLLMClient, ModelResponse
+from hedgeagent.prompts.prompt_builder import SCHEMA_DESCRIPTION
+from hedgeagent.schemas.agent import AgentDecision
+from hedgeagent.schemas.common import ActionType
+from hedgeagent.schemas.episode import EpisodeSpec
+
+
+class ScriptedClient(BaseLLMClient):
+    def __init__(self, *texts: str) -> None:
+        self.model_name = "scripted-model"
+        self._responses = iter(
+            [
+                ModelResponse(
+                    model_name=self.model_name,
+                    text=text,
+                    latency_ms=1.0,
+                    raw_request={"prompt": "stub"},
+                    raw_response={"response": text},
+                )
+                for text in texts
+            ]
+        )
+        self.prompts: list[str] = []
+
+    def complete(self, prompt: str, system_prompt: str | None = None) -> ModelResponse:
+        del system_prompt
+        self.prompts.append(prompt)
+        return next(self._responses)
+
+
+@pytest.fixture(scope="module")
+def val_spec(dataset_splits: Callable[..., dict[str, list[EpisodeSpec]]]) -> EpisodeSpec:
+    return dataset_splits(train_size=1, val_size=1, test_size=1, seed=5)["val"][0]
+
+
+@pytest.fixture
+def context(val_spec: EpisodeSpec) -> DecisionContext:
+    env = GridWorld(val_spec)
+    return DecisionContext(
+        state=env.visible_state(),
+        env=env,
+        step_index=0,
+        max_steps=4,
+        tool_history=[],
+        trace=[],
+        rng=random.Random(0),
+    )
+
+
+def test_lowercase_action_type_is_normalized_without_repair_call(context: DecisionContext) -> None:
+    client = ScriptedClient('{"action_type": " abstain", "rationale_brief": "Too uncertain.", "confidence": 0.6, "abstain_reason": "test"}')
+    result = LLMPolicy(client).decide(context)
+    assert len(client.prompts) == 1
+    assert result.schema_valid is True
+    assert result.decision is not None
+    assert result.decision.action_type == ActionType.ABSTAIN
+    assert result.model_call is not None
+    assert result.model_call.normalized is True
+    assert result.model_call.repaired is False
+
+
+def test_chosen_tool_name_is_normalized(context: DecisionContext) -> None:
+    client = ScriptedClient('{"action_type": "TOOL", "rationale_brief": "Check path.", "chosen_tool": "Plan_Path ", "confidence": 0.5}')
+    result = LLMPolicy(client).decide(context)
+    assert len(client.prompts) == 1
+    assert result.decision is not None
+    assert result.decision.chosen_tool == "plan_path"
+
+
+def test_repair_prompt_starts_with_static_schema_prefix(context: DecisionContext) -> None:
+    client = ScriptedClient("not json", "not json")
+    result = LLMPolicy(client).decide(context)
+    assert len(client.prompts) == 2
+    assert result.schema_valid is False
+    repair_prompt = client.prompts[1]
+    assert repair_prompt.startswith(_REPAIR_PROMPT_PREFIX)
+    assert SCHEMA_DESCRIPTION in _REPAIR_PROMPT_PREFIX
+    assert repair_prompt.endswith("Invalid response:\nnot json\nValidation error:\nNo JSON object found in model output.: line 1 column 1 (char 0)\n")
+
+
+def test_repair_response_is_used_when_valid(context: DecisionContext) -> None:
+    client = ScriptedClient(
+        "I think we should abstain.",
+        '{"action_type": "ABSTAIN", "rationale_brief": "Too uncertain.", "confidence": 0.4, "abstain_reason": "repair"}',
+    )
+    result = LLMPolicy(client).decide(context)
+    assert len(client.prompts) == 2
+    assert client.prompts[1].startswith(_REPAIR_PROMPT_PREFIX)
+    assert result.schema_valid is True
+    assert result.decision is not None
+    assert result.decision.abstain_reason == "repair"
+    assert result.model_call is not None and result.model_call.repaired is True
+
+
+@pytest.mark.parametrize(
+    ("payload", "expected_subset", "expected_normalized"),
+    [
+        pytest.param({"action_type": "ACT", "chosen_tool": "plan_path"}, {"action_type": "ACT", "chosen_tool": "plan_path"}, False, id="canonical"),
+        pytest.param({"action_type": " query "}, {"action_type": "QUERY"}, True, id="action_case_and_space"),
+        pytest.param({"action_type": "TOOL", "chosen_tool": "Plan_Path "}, {"chosen_tool": "plan_path"}, True, id="tool_case_and_space"),
+        pytest.param(
+            {"action_type": "QUERY", "tool_args": {"center": {"x": 1, "y": 2}, "radius": 1}},
+            {"tool_args": {"radius": 1, "target": {"x": 1, "y": 2}}},
+            True,
+            id="query_center_to_target",
+        ),
+        pytest.param({"action_type": "QUERY", "chosen_tool": "reveal_observation"}, {"chosen_tool": None}, True, id="query_drops_reveal_tool"),
+        pytest.param(
+            {"action_type": "TOOL", "chosen_tool": "reveal_observation", "tool_args": {"center": {"x": 1, "y": 2}}},
+            {"chosen_tool": "reveal_observation", "tool_args": {"center": {"x": 1, "y": 2}}},
+            False,
+            id="tool_keeps_center",
+        ),
+    ],
+)
+def test_normalize_payload_cases(payload: dict[str, Any], expected_subset: dict[str, Any], expected_normalized: bool) -> None:
+    result, normalized = LLMPolicy(ScriptedClient())._normalize_payload(payload)
+    assert normalized is expected_normalized
+    for key, value in expected_subset.items():
+        assert result[key] == value
+    if not normalized:
+        assert result is payload
+
+
+@pytest.mark.parametrize(
+    ("fields", "expected_valid"),
+    [
+        ({"action_type": "ACT"}, False),
+        ({"action_type": "ACT", "final_answer": {"proposed_path": []}}, True),
+        ({"action_type": "ABSTAIN"}, False),
+        ({"action_type": "ABSTAIN", "abstain_reason": "too uncertain"}, True),
+        ({"action_type": "TOOL"}, False),
+        ({"action_type": "TOOL", "chosen_tool": "plan_path"}, True),
+        ({"action_type": "QUERY", "tool_args": {"center": {"x": 1, "y": 1}}}, False),
+        ({"action_type": "QUERY", "tool_args": {"target": {"x": 1, "y": 1}}}, True),
+    ],
+)
+def test_decision_shape_truth_table(fields: dict[str, Any], expected_valid: bool) -> None:
+    payload = {"rationale_brief": "Checking.", "confidence": 0.5, **fields}
+    try:
+        AgentDecision.model_validate(payload)
+    except ValidationError:
+        valid = False
+    else:
+        valid = True
+    assert valid is expected_valid
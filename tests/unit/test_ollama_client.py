@@ -0,0 +1,307 @@
+from concurrent.futures import Future
+import http.client
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+from pathlib import Path
+import subprocess
+import threading
+import time
+from typing import Any
+
+import pytest
+
+from hedgeagent.config.types import OllamaConfig
+from hedgeagent.models import ollama_client
+from hedgeagent.models.ollama_client import OllamaClient
+
+
+def _install_fake_http(monkeypatch: pytest.MonkeyPatch) -> list[dict[str, Any]]:
+    calls: list[dict[str, Any]] = []
+
+    def fake_http_json(url: str, payload: dict[str, Any] | None = None, timeout: float = 5.0, session: Any = None) -> tuple[bool, dict[str, Any]]:
+        del url, timeout, session
+        calls.append(payload or {})
+        return True, {"model": "fake", "response": f'{{"call": {len(calls)}}}'}
+
+    monkeypatch.setattr(ollama_client, "_http_json", fake_http_json)
+    return calls
+
+
+def test_response_cache_replays_greedy_requests(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _install_fake_http(monkeypatch)
+    client = OllamaClient(model_name="fake", config=OllamaConfig(temperature=0.0))
+    first = client.complete(prompt="same prompt", system_prompt="Return only JSON.")
+    second = client.complete(prompt="same prompt", system_prompt="Return only JSON.")
+    third = client.complete(prompt="other prompt", system_prompt="Return only JSON.")
+    assert len(calls) == 2
+    assert second.text == first.text
+    assert second.cached is True
+    assert second.latency_ms == 0.0
+    assert third.cached is False
+    assert client.cache_stats == {"hits": 1, "misses": 2}
+
+
+def test_response_cache_disabled_for_sampled_requests(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _install_fake_http(monkeypatch)
+    client = OllamaClient(model_name="fake", config=OllamaConfig(temperature=0.1))
+    client.complete(prompt="same prompt")
+    client.complete(prompt="same prompt")
+    assert len(calls) == 2
+    assert client.cache_stats == {"hits": 0, "misses": 0}
+
+
+def test_response_cache_persists_to_disk_across_clients(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    calls = _install_fake_http(monkeypatch)
+    config = OllamaConfig(temperature=0.0, response_cache_dir=str(tmp_path))
+    first = OllamaClient(model_name="fake", config=config).complete(prompt="same prompt")
+    replayed = OllamaClient(model_name="fake", config=config).complete(prompt="same prompt")
+    assert len(calls) == 1
+    assert replayed.cached is True
+    assert replayed.text == first.text
+    assert len(list(tmp_path.glob("*/*.json"))) == 1
+
+
+def test_corrupt_disk_cache_entry_is_a_miss_and_overwritten(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    calls = _install_fake_http(monkeypatch)
+    config = OllamaConfig(temperature=0.0, response_cache_dir=str(tmp_path))
+    OllamaClient(model_name="fake", config=config).complete(prompt="same prompt")
+    (entry,) = tmp_path.glob("*/*.json")
+    entry.write_text('{"model_name": "fa', encoding="utf-8")
+    rerun = OllamaClient(model_name="fake", config=config).complete(prompt="same prompt")
+    assert len(calls) == 2
+    assert rerun.cached is False
+    replayed = OllamaClient(model_name="fake", config=config).complete(prompt="same prompt")
+    assert len(calls) == 2
+    assert replayed.text == rerun.text
+
+
+def test_unreadable_disk_cache_entry_is_a_miss(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    calls = _install_fake_http(monkeypatch)
+    config = OllamaConfig(temperature=0.0, response_cache_dir=str(tmp_path))
+    OllamaClient(model_name="fake", config=config).complete(prompt="same prompt")
+    (entry,) = tmp_path.glob("*/*.json")
+    entry.unlink()
+    entry.mkdir()
+    response = OllamaClient(model_name="fake", config=config).complete(prompt="same prompt")
+    assert len(calls) == 2
+    assert response.error is None
+    assert response.cached is False
+
+
+def test_response_cache_evicts_least_recently_used(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _install_fake_http(monkeypatch)
+    client = OllamaClient(model_name="fake", config=OllamaConfig(temperature=0.0, response_cache_max_entries=2))
+    client.complete(prompt="a")
+    client.complete(prompt="b")
+    client.complete(prompt="a")
+    client.complete(prompt="c")
+    client.complete(prompt="a")
+    client.complete(prompt="b")
+    assert len(calls) == 4
+    assert client.cache_stats == {"hits": 2, "misses": 4}
+
+
+def test_parse_cli_models_skips_header_and_blank_lines() -> None:
+    stdout = (
+        "NAME              ID              SIZE      MODIFIED\n"
+        "\n"
+        "qwen2.5vl:7b      5ced39dfa4ba    6.0 GB    2 days ago\n"
+        "  llama3.2:3b     a80c4f17acd5    2.0 GB    3 weeks ago  \n"
+    )
+    models = ollama_client._parse_cli_models(stdout)
+    assert [model["name"] for model in models] == ["qwen2.5vl:7b", "llama3.2:3b"]
+    assert models[1]["raw"] == "llama3.2:3b     a80c4f17acd5    2.0 GB    3 weeks ago"
+
+
+def test_run_command_reports_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fake_run(args: list[str], **kwargs: Any) -> subprocess.CompletedProcess[str]:
+        raise subprocess.TimeoutExpired(cmd=args, timeout=kwargs["timeout"])
+
+    monkeypatch.setattr(ollama_client.subprocess, "run", fake_run)
+    result = ollama_client._run_command(["ollama", "list"], timeout=0.5)
+    assert result == {"ok": False, "returncode": 124, "stdout": "", "stderr": "timeout"}
+
+
+class _InlineExecutor:
+    def __init__(self, max_workers: int) -> None:
+        del max_workers
+
+    def __enter__(self) -> "_InlineExecutor":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+    def submit(self, fn: Any, *args: Any) -> Future:
+        future: Future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+def test_probe_result_does_not_depend_on_concurrency(monkeypatch: pytest.MonkeyPatch) -> None:
+    outputs = {
+        "pgrep": "4242 ollama serve",
+        "--version": "ollama version is 0.6.0",
+        "--help": "\n".join(f"help line {index}" for index in range(20)),
+        "list": "NAME ID SIZE MODIFIED\nqwen2.5vl:7b 5ced39dfa4ba 6.0 GB 2 days ago",
+    }
+    delays = {"pgrep": 0.03, "--version": 0.0, "--help": 0.02, "list": 0.01}
+
+    def fake_run_command(args: list[str], timeout: float = 10.0) -> dict[str, Any]:
+        del timeout
+        key = args[0] if args[0] == "pgrep" else args[-1]
+        time.sleep(delays[key])
+        return {"ok": True, "returncode": 0, "stdout": outputs[key], "stderr": ""}
+
+    def fake_http_json(url: str, payload: Any = None, timeout: float = 5.0, session: Any = None) -> tuple[bool, dict[str, Any]]:
+        del payload, timeout, session
+        if url.endswith("/api/tags"):
+            time.sleep(0.02)
+            return True, {"models": [{"name": "qwen2.5vl:7b", "size": 6}]}
+        return True, {"version": "0.6.0"}
+
+    monkeypatch.setattr(ollama_client.shutil, "which", lambda name: f"/usr/bin/{name}")
+    monkeypatch.setattr(ollama_client, "_run_command", fake_run_command)
+    monkeypatch.setattr(ollama_client, "_http_json", fake_http_json)
+    config = OllamaConfig()
+    concurrent = ollama_client.probe_ollama(config)
+    monkeypatch.setattr(ollama_client, "ThreadPoolExecutor", _InlineExecutor)
+    sequential = ollama_client.probe_ollama(config)
+    assert concurrent == sequential
+    assert concurrent["running_processes"] == "4242 ollama serve"
+    assert concurrent["daemon_version"] == "0.6.0"
+    assert concurrent["help_snippet"] == "\n".join(f"help line {index}" for index in range(12))
+    assert [model["name"] for model in concurrent["models"]] == ["qwen2.5vl:7b"]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "\n".join(f"line {index}" for index in range(20)),
+        "short\ntext",
+        "",
+        "trailing\n" * 15,
+        "a\nb\n",
+        "usage\r\n  -h\r\n  -v\r\n",
+        "page one\x0cpage two\nnext",
+        "\r\n".join(f"line {index}" for index in range(20)),
+        "\n" * 14 + "late",
+    ],
+    ids=["long", "short", "empty", "trailing_newlines", "short_trailing_newline", "crlf", "form_feed", "long_crlf", "blank_lines"],
+)
+def test_head_lines_matches_splitlines_prefix(text: str) -> None:
+    assert ollama_client._head_lines(text, 12) == "\n".join(text.splitlines()[:12])
+
+
+class _FakeStreamResponse:
+    def __init__(self, chunks: list[dict[str, Any]]) -> None:
+        self.lines = [json.dumps(chunk).encode("utf-8") + b"\n" for chunk in chunks]
+        self.lines_read = 0
+
+    def __enter__(self) -> "_FakeStreamResponse":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+    def __iter__(self):
+        for line in self.lines:
+            self.lines_read += 1
+            yield line
+
+
+def test_stream_stops_once_json_object_closes(monkeypatch: pytest.MonkeyPatch) -> None:
+    pieces = ['Sure: {"action_type": "ABSTAIN", ', '"abstain_reason": "a } in text"', "}", " trailing chatter", " more"]
+    fake = _FakeStreamResponse([{"model": "fake", "response": piece, "done": False} for piece in pieces])
+    monkeypatch.setattr(ollama_client.request, "urlopen", lambda req, timeout: fake)
+    client = OllamaClient(model_name="fake", config=OllamaConfig(stream=True))
+    response = client.complete(prompt="decide")
+    assert response.text == 'Sure: {"action_type": "ABSTAIN", "abstain_reason": "a } in text"}'
+    assert response.raw_request["stream"] is True
+    assert response.raw_response["done_reason"] == "client_stop"
+    assert fake.lines_read == 3
+
+
+class _BrokenStreamResponse(_FakeStreamResponse):
+    def __init__(self, chunks: list[dict[str, Any]], failure: Exception) -> None:
+        super().__init__(chunks)
+        self.failure = failure
+
+    def __iter__(self):
+        yield from super().__iter__()
+        raise self.failure
+
+
+@pytest.mark.parametrize(
+    "failure",
+    [ConnectionResetError(104, "Connection reset by peer"), http.client.IncompleteRead(b"partial")],
+    ids=["connection_reset", "incomplete_read"],
+)
+def test_stream_failure_midway_is_retried_and_reported(monkeypatch: pytest.MonkeyPatch, failure: Exception) -> None:
+    attempts: list[_BrokenStreamResponse] = []
+
+    def fake_urlopen(req: Any, timeout: float) -> _BrokenStreamResponse:
+        del req, timeout
+        attempts.append(_BrokenStreamResponse([{"model": "fake", "response": "Sure: ", "done": False}], failure))
+        return attempts[-1]
+
+    monkeypatch.setattr(ollama_client.request, "urlopen", fake_urlopen)
+    client = OllamaClient(model_name="fake", config=OllamaConfig(stream=True, max_retries=1))
+    response = client.complete(prompt="decide")
+    assert len(attempts) == 2
+    assert response.text == ""
+    assert response.error == str(failure)
+
+
+def test_keep_alive_session_reuses_one_connection() -> None:
+    peers: list[tuple[str, int]] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:
+            self.rfile.read(int(self.headers["Content-Length"]))
+            peers.append(self.client_address)
+            body = json.dumps({"model": "fake", "response": '{"ok": true}'}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: Any) -> None:
+            del args
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        with OllamaClient(model_name="fake", config=OllamaConfig(base_url=base_url, temperature=0.1)) as client:
+            first = client.complete(prompt="one")
+            second = client.complete(prompt="two")
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert first.error is None and second.error is None
+    assert len(peers) == 2
+    assert peers[0] == peers[1]
+    assert client._session._connections == {}
+
+
+@pytest.mark.parametrize(
+    ("pieces", "expected_close"),
+    [
+        pytest.param(
+            ["Answer ", "now: ", "{", '"note": "a ', "\\", '"', " still text ", "}", '"', "}", " tail"], 9, id="escape_across_plain_tokens"
+        ),
+        pytest.param(['{"action_type": "ABSTAIN"}', " tail"], 0, id="single_piece"),
+        pytest.param(["} stray ", '{"a": ', '{"b": 1}', "}"], 3, id="nested_after_stray_brace"),
+        pytest.param(['{"s": "}"', "}"], 1, id="brace_inside_string"),
+        pytest.param(['{"a": 1', ", ", '"b": 2'], None, id="never_closes"),
+    ],
+)
+def test_json_scanner_reports_first_closing_piece(pieces: list[str], expected_close: int | None) -> None:
+    scanner = ollama_client._JsonObjectScanner()
+    closed_at = next((index for index, piece in enumerate(pieces) if scanner.feed(piece)), None)
+    assert closed_at == expected_close
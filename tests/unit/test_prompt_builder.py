@@ -0,0 +1,81 @@
+from collections.abc import Callable
+
+import pytest
+
+from hedgeagent.envs.grid import GridWorld
+from hedgeagent.prompts.prompt_builder import (
+    _ALLOWED_TOOLS_TEXT,
+    SCHEMA_DESCRIPTION,
+    _bind_static_fields,
+    build_decision_prompt,
+    load_prompt_template,
+)
+from hedgeagent.schemas.episode import EpisodeSpec
+from hedgeagent.tools.registry import ToolRegistry
+
+_PROMPT_VERSIONS = ("decision_prompt_v1.txt", "decision_prompt_v2.txt")
+_V1_PROMPT, _V2_PROMPT = _PROMPT_VERSIONS
+
+
+@pytest.fixture(scope="module")
+def val_specs(dataset_splits: Callable[..., dict[str, list[EpisodeSpec]]]) -> list[EpisodeSpec]:
+    return dataset_splits(train_size=1, val_size=2, test_size=1, seed=3)["val"]
+
+
+def test_tool_history_omits_revealed_points(val_specs: list[EpisodeSpec], tool_registry: ToolRegistry) -> None:
+    env = GridWorld(val_specs[0])
+    reveal = tool_registry.call("reveal_observation", env, {"target": {"x": 4, "y": 4}, "radius": 1})
+    assert reveal.payload["revealed_points"]
+    prompt = build_decision_prompt(
+        state=env.visible_state(),
+        tool_history=[reveal],
+        step_index=1,
+        max_steps=6,
+        version=_V2_PROMPT,
+    )
+    assert "newly_revealed" in prompt
+    assert "revealed_points" not in prompt
+
+
+def test_v1_tool_history_keeps_full_payload(val_specs: list[EpisodeSpec], tool_registry: ToolRegistry) -> None:
+    env = GridWorld(val_specs[0])
+    reveal = tool_registry.call("reveal_observation", env, {"target": {"x": 4, "y": 4}, "radius": 1})
+    prompt = build_decision_prompt(
+        state=env.visible_state(),
+        tool_history=[reveal],
+        step_index=1,
+        max_steps=6,
+        version=_V1_PROMPT,
+    )
+    assert f"reveal_observation: ok payload={reveal.payload}" in prompt
+
+
+def test_v2_prompt_keeps_static_instructions_as_shared_prefix(val_specs: list[EpisodeSpec]) -> None:
+    prompts = [
+        build_decision_prompt(
+            state=GridWorld(spec).visible_state(),
+            tool_history=[],
+            step_index=step_index,
+            max_steps=6,
+            version=_V2_PROMPT,
+        )
+        for step_index, spec in enumerate(val_specs)
+    ]
+    static_end = prompts[0].index("Semantic hints:")
+    assert prompts[1].startswith(prompts[0][:static_end])
+    assert "task_id=" not in prompts[0][:static_end]
+
+
+@pytest.mark.parametrize("version", _PROMPT_VERSIONS)
+def test_static_field_binding_matches_full_format(version: str) -> None:
+    fields = {
+        "state_summary": "map {with braces}",
+        "tool_history": "none",
+        "semantic_hints": "none",
+        "step_index": 2,
+        "max_steps": 6,
+    }
+    expected = load_prompt_template(version).format(
+        allowed_tools=_ALLOWED_TOOLS_TEXT, schema_description=SCHEMA_DESCRIPTION, **fields
+    )
+    assert _bind_static_fields(version).format(**fields) == expected